@@ -0,0 +1,57 @@
+import numpy as np
+
+
+DISTRIBUTIONS = ("random", "sorted", "nearly_sorted", "reversed", "few_unique", "sawtooth")
+
+
+def _base_values(rng, size, max_value, duplicates):
+    """Sorted pool of `size` values in 1..max_value"""
+    if duplicates:
+        values = rng.integers(1, max_value + 1, size=size, dtype=np.int64)
+    else:
+        values = rng.choice(max_value, size=size, replace=False).astype(np.int64) + 1
+    values.sort()
+    return values
+
+
+def generate_array(size, distribution="random", duplicates=False, max_value=None, seed=None):
+    """Generate an int64 array of `size` elements in one vectorized call.
+
+    Values lie in 1..max_value (default max(100, size)) and are distinct
+    unless `duplicates` is set; "few_unique" always repeats values. Passing
+    the same `seed` reproduces the same array.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+
+    rng = np.random.default_rng(seed)
+    if max_value is None:
+        max_value = max(100, size)
+    if not duplicates and max_value < size:
+        max_value = size
+
+    if distribution == "few_unique":
+        pool = rng.choice(max_value, size=min(8, size), replace=False) + 1
+        return rng.choice(pool, size=size).astype(np.int64)
+
+    values = _base_values(rng, size, max_value, duplicates)
+
+    if distribution == "random":
+        rng.shuffle(values)
+    elif distribution == "sorted":
+        pass
+    elif distribution == "nearly_sorted":
+        # Swap about 5% of the positions with a random partner; the
+        # positions are distinct so every swap is a true exchange
+        swaps = min(max(size // 20, 1), size // 2)
+        idx = rng.choice(size, 2 * swaps, replace=False)
+        a, b = idx[:swaps], idx[swaps:]
+        values[a], values[b] = values[b], values[a]
+    elif distribution == "reversed":
+        values = values[::-1].copy()
+    elif distribution == "sawtooth":
+        # Interleave the sorted pool into ascending runs
+        teeth = max(min(size // 10, 8), 2)
+        values = np.concatenate([values[t::teeth] for t in range(teeth)])
+
+    return values
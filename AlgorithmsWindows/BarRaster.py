@@ -0,0 +1,66 @@
+"""NumPy bar rasterisation shared by the batched bar item and the exporter.
+
+Pixels are ARGB32 uint32 values, one row per image line, so the result
+can be wrapped in a QImage without conversion. This module stays free of
+Qt so exporter worker processes start quickly.
+"""
+import numpy as np
+
+
+def column_starts(n, width):
+    """First element of each pixel column when n > width elements share `width` columns"""
+    return (np.arange(width, dtype=np.int64) * n + width - 1) // width
+
+
+def column_ranks(slots, base_slot):
+    """Rank of each element's colour slot; the base colour ranks lowest"""
+    ranks = slots.astype(np.int16)
+    if base_slot is not None:
+        ranks[slots == base_slot] = -1
+    return ranks
+
+
+def aggregate_columns(values, ranks, starts):
+    """Return each column's (min, max, sum, highest rank)"""
+    return (np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts),
+            np.add.reduceat(values, starts), np.maximum.reduceat(ranks, starts))
+
+
+def blend(colors, background, alpha):
+    """Mix ARGB colours with the background, alpha in 0..256"""
+    background = np.uint32(background)
+    mixed = np.uint32(0xff000000)
+    for shift in (16, 8, 0):
+        color = (colors >> shift) & 0xff
+        back = (background >> shift) & 0xff
+        mixed = mixed | (((color * alpha + back * (256 - alpha)) >> 8) << shift)
+    return mixed.astype(np.uint32)
+
+
+def bar_pixels(values, slots, palette, background, width, height, max_value):
+    """One bar per element, sampled per pixel column with a 1px gap between wide bars"""
+    n = len(values)
+    columns = np.arange(width)
+    index = columns * n // width
+    bar_top = height - (values[index] * height // max_value)
+    colors = np.asarray(palette, dtype=np.uint32)[slots[index]]
+    if width >= 4 * n:
+        gap = (columns + 1) * n // width != index
+        colors = np.where(gap, np.uint32(background), colors)
+
+    rows = np.arange(height, dtype=np.int64)[:, None]
+    pixels = np.where(rows >= bar_top[None, :], colors[None, :], np.uint32(background))
+    return np.ascontiguousarray(pixels, dtype=np.uint32)
+
+
+def envelope_pixels(col_min, col_mean, col_max, colors, background, height, max_value):
+    """Per-column envelopes: solid up to the minimum, then lighter bands up to the mean and the maximum"""
+    min_top = height - col_min * height // max_value
+    mean_top = height - col_mean * height // max_value
+    max_top = height - col_max * height // max_value
+
+    rows = np.arange(height, dtype=np.int64)[:, None]
+    pixels = np.where(rows >= max_top[None, :], blend(colors, background, 100)[None, :], np.uint32(background))
+    pixels = np.where(rows >= mean_top[None, :], blend(colors, background, 190)[None, :], pixels)
+    pixels = np.where(rows >= min_top[None, :], colors[None, :], pixels)
+    return np.ascontiguousarray(pixels, dtype=np.uint32)
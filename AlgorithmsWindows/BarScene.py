@@ -0,0 +1,170 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont, QFontMetricsF, QTransform
+
+from BatchedBars import BatchedBarItem
+
+
+# Above this many elements the whole array is drawn as one batched item
+ITEM_LIMIT = 200
+
+# Quiet time after the last resize before the bars are laid out again
+RESIZE_SETTLE_MS = 150
+
+
+class BarScene:
+    """Retained bar renderer for a QGraphicsScene.
+
+    Bar items are created once per array. After that only the bars a step
+    touched get their geometry and colour updated, so the cost of a frame
+    is proportional to the change rather than to the array size.
+
+    `mode` is "items" (one item per bar), "batched" (one item for the
+    whole array) or "auto", which switches to batched above ITEM_LIMIT.
+
+    `color_states()` returns every bar's color as a NumPy array of indices
+    into `palette`; it is the only source of bar colors. Owners that already
+    computed the states for a frame pass them to update_bars() or refresh()
+    so they are not built twice.
+    `base_color` is the plain bar colour; the batched renderer lets any
+    other colour show through when it merges bars into pixel columns.
+
+    With `opengl` set, the array is always drawn as one batched item, which
+    renders from a vertex buffer when the view has an OpenGL viewport.
+
+    Call resized() from the owner's resizeEvent: while the size keeps
+    changing the existing bars are only stretched with a view transform,
+    and layout() runs once the resizing has settled.
+    """
+
+    def __init__(self, scene, view, item_class, color_states, palette, mode="auto", base_color=None):
+        self.scene = scene
+        self.view = view
+        self.item_class = item_class
+        self.color_states = color_states
+        self.palette = palette
+        self.base_color = base_color
+        self.mode = mode
+        self.opengl = False
+        self.array = []
+        self.items = []
+        self.batch = None
+        self.max_value = 1
+        self.bar_width = 0
+        self.view_height = 0
+        self.show_labels = True
+
+        # Same font as the bar labels, used to decide whether they fit
+        font = QFont()
+        font.setPointSize(8)
+        font.setBold(True)
+        self.metrics = QFontMetricsF(font)
+
+        self.layout_size = None
+        self.settle_timer = QTimer()
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.layout)
+
+    def use_batch(self, n):
+        return self.opengl or self.mode == "batched" or (self.mode == "auto" and n > ITEM_LIMIT)
+
+    def set_array(self, array, max_value=None):
+        """Rebuild the bar items for a new array, scaled to `max_value` if given"""
+        self.scene.clear()
+        self.array = array
+        self.items = []
+        self.batch = None
+
+        if not array:
+            return
+
+        self.max_value = max_value or max(array) or 1
+        if self.use_batch(len(array)):
+            self.batch = BatchedBarItem(array, self.scene.backgroundBrush().color(), self.base_color, self.opengl,
+                                        self.max_value)
+            self.scene.addItem(self.batch)
+        else:
+            for i, value in enumerate(array):
+                item = self.item_class(value, i, 0, 0)
+                self.items.append(item)
+                self.scene.addItem(item)
+        self.layout()
+
+    def layout(self):
+        """Recompute geometry and colour of every bar, e.g. after a resize"""
+        self.settle_timer.stop()
+        self.view.resetTransform()
+        if not self.array:
+            self.layout_size = None
+            return
+
+        # Calculate bar dimensions
+        view_width = self.view.width() - 20
+        self.view_height = self.view.height() - 50
+        self.bar_width = view_width / len(self.array)
+        self.layout_size = (view_width, self.view_height) if view_width > 0 and self.view_height > 0 else None
+
+        # Drop labels once bars get narrower than the widest value or index
+        label = str(max(self.max_value, len(self.array) - 1))
+        self.show_labels = self.bar_width - 2 >= self.metrics.horizontalAdvance(label)
+
+        if self.batch is not None:
+            self.batch.set_size(view_width, self.view_height, self.show_labels)
+        else:
+            for item in self.items:
+                item.show_labels = self.show_labels
+        self.refresh()
+
+    def resized(self):
+        """Stretch the bars to the new view size now and lay them out once resizing stops"""
+        if self.layout_size is not None:
+            width, height = self.layout_size
+            scale_x = max(self.view.width() - 20, 1) / width
+            scale_y = max(self.view.height() - 50, 1) / height
+            self.view.setTransform(QTransform.fromScale(scale_x, scale_y))
+        self.settle_timer.start()
+
+    def update_bars(self, indices, states=None):
+        """Update only the bars at `indices`, colored from `states` if given"""
+        n = len(self.array)
+        if states is None:
+            states = self.color_states()
+
+        # Past a quarter of the array one vectorized refresh is cheaper
+        if len(indices) > n // 4:
+            self.refresh(states)
+            return
+
+        for i in indices:
+            if 0 <= i < n:
+                self._update_bar(i, self.palette[states[i]])
+        if self.batch is not None:
+            self.batch.flush()
+
+    def refresh(self, states=None):
+        """Update every bar, e.g. when the whole color state changes"""
+        if states is None:
+            states = self.color_states()
+        if self.batch is not None:
+            self.batch.set_bars(self.array, states, self.palette)
+            self.batch.flush()
+            return
+
+        for i in range(len(self.array)):
+            self._place_bar(i)
+            self.items[i].set_color(self.palette[states[i]])
+
+    def _update_bar(self, i, color):
+        if self.batch is not None:
+            self.batch.set_bar(i, self.array[i], color)
+            return
+
+        self._place_bar(i)
+        self.items[i].set_color(color)
+
+    def _place_bar(self, i):
+        value = self.array[i]
+        item = self.items[i]
+        bar_height = (value / self.max_value) * self.view_height
+        item.set_geometry(value, self.bar_width - 2, bar_height)
+        item.setPos(i * self.bar_width, self.view_height - bar_height)
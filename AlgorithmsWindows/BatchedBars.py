@@ -0,0 +1,174 @@
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QColor, QImage
+import numpy as np
+
+from BarRaster import aggregate_columns, bar_pixels, column_ranks, column_starts, envelope_pixels
+from GLBars import GL_BAR_LIMIT, GLBarBuffer, uses_opengl
+from PaintResources import LABEL_FONT, LABEL_PEN, RESOURCES
+
+
+class BatchedBarItem(QGraphicsItem):
+    """Draws a whole array as a single item.
+
+    The bars are rasterised into one NumPy-built image from the value and
+    colour buffers, so the scene holds one item however large the array is.
+    Per-bar labels are only drawn while the bars are wide enough for them.
+
+    Once there are more elements than pixel columns, each column instead
+    shows the min/mean/max envelope of the elements it covers, coloured by
+    its most important state: any colour other than `base_color` wins over
+    it. The per-column aggregates are only recomputed for the columns that
+    changed, so a frame costs the view size rather than the array length.
+
+    With `opengl` set and an OpenGL viewport, the bars are drawn from a
+    GLBarBuffer instead of the image, for arrays up to GL_BAR_LIMIT.
+
+    Bars are scaled to `max_value`, by default the largest value given.
+    """
+
+    def __init__(self, values, background, base_color=None, opengl=False, max_value=None, parent=None):
+        super().__init__(parent)
+        self.values = np.array(values, dtype=np.int64)
+        self.color_index = np.zeros(len(self.values), dtype=np.uint8)
+        self.palette = []
+        self.palette_index = {}
+        self.background = QColor(background).rgba()
+        if max_value is None:
+            max_value = int(self.values.max()) if len(self.values) else 1
+        self.max_value = max(max_value, 1)
+        self.width = 0
+        self.height = 0
+        self.show_labels = False
+        self.base_slot = self._palette_slot(QColor(base_color)) if base_color is not None else None
+        self._image = None
+        self._pixels = None
+
+        # Level of detail: column c covers elements starts[c] up to ends[c]
+        self.lod = False
+        self.starts = None
+        self.ends = None
+        self.col_min = None
+        self.col_max = None
+        self.col_sum = None
+        self.col_rank = None
+        self._dirty = set()
+
+        n = len(self.values)
+        self.gl_bars = GLBarBuffer(n) if opengl and 0 < n <= GL_BAR_LIMIT else None
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width, self.height + 17)
+
+    def set_size(self, width, height, show_labels):
+        self.prepareGeometryChange()
+        self.width = width
+        self.height = height
+        self.show_labels = show_labels
+        self._image = None
+
+        n, columns = len(self.values), int(width)
+        self.lod = n > columns > 0 and self.gl_bars is None
+        if self.lod:
+            self.starts = column_starts(n, columns)
+            self.ends = np.append(self.starts[1:], n)
+            self._aggregate_all()
+
+    def set_bar(self, i, value, color):
+        """Update one bar; call flush() once the batch of changes is done"""
+        self.values[i] = value
+        self.color_index[i] = self._palette_slot(color)
+        if self.lod:
+            self._dirty.add(i)
+        if self.gl_bars is not None:
+            self.gl_bars.mark(i)
+        self._image = None
+
+    def set_bars(self, values, states, palette):
+        """Update every bar at once from `states`, an array of indices into `palette`"""
+        self.values[:] = values
+        slots = np.array([self._palette_slot(color) for color in palette], dtype=np.uint8)
+        self.color_index = slots[states]
+        if self.lod:
+            self._aggregate_all()
+        if self.gl_bars is not None:
+            self.gl_bars.mark_all()
+        self._image = None
+
+    def flush(self):
+        if self._image is None:
+            self.update()
+
+    def _palette_slot(self, color):
+        rgba = color.rgba()
+        slot = self.palette_index.get(rgba)
+        if slot is None:
+            slot = len(self.palette)
+            self.palette.append(rgba)
+            self.palette_index[rgba] = slot
+        return slot
+
+    def _aggregate_all(self):
+        self._dirty.clear()
+        self.col_min, self.col_max, self.col_sum, self.col_rank = aggregate_columns(
+            self.values, column_ranks(self.color_index, self.base_slot), self.starts)
+
+    def _aggregate_dirty(self):
+        columns = np.unique(np.fromiter(self._dirty, np.int64, len(self._dirty)) * len(self.starts) // len(self.values))
+        self._dirty.clear()
+
+        # Many scattered changes are cheaper as one vectorized pass
+        if len(columns) > len(self.starts) // 4:
+            self._aggregate_all()
+            return
+
+        for c in columns.tolist():
+            start, end = self.starts[c], self.ends[c]
+            values = self.values[start:end]
+            self.col_min[c] = values.min()
+            self.col_max[c] = values.max()
+            self.col_sum[c] = values.sum()
+            self.col_rank[c] = column_ranks(self.color_index[start:end], self.base_slot).max()
+
+    def _render_image(self):
+        width, height = int(self.width), int(self.height)
+        n = len(self.values)
+        if width <= 0 or height <= 0 or n == 0:
+            return None
+
+        if self.lod:
+            if self._dirty:
+                self._aggregate_dirty()
+            slots = np.where(self.col_rank < 0, self.base_slot if self.base_slot is not None else 0, self.col_rank)
+            colors = np.array(self.palette, dtype=np.uint32)[slots]
+            self._pixels = envelope_pixels(self.col_min, self.col_sum // (self.ends - self.starts), self.col_max,
+                                           colors, self.background, height, self.max_value)
+        else:
+            self._pixels = bar_pixels(self.values, self.color_index, self.palette, self.background,
+                                      width, height, self.max_value)
+        return QImage(self._pixels.data, width, height, width * 4, QImage.Format_ARGB32)
+
+    def paint(self, painter, option, widget):
+        if self.width <= 0 or self.height <= 0:
+            return
+        if self.gl_bars is not None and uses_opengl(painter):
+            self.gl_bars.draw(painter, self)
+        else:
+            if self._image is None:
+                self._image = self._render_image()
+            if self._image is None:
+                return
+            painter.drawImage(QRectF(0, 0, int(self.width), int(self.height)), self._image)
+
+        if not self.show_labels:
+            return
+
+        # Value and index labels, only when every bar can fit its text
+        painter.setPen(LABEL_PEN)
+        painter.setFont(LABEL_FONT)
+        bar_width = self.width / len(self.values)
+        for i, value in enumerate(self.values.tolist()):
+            x = i * bar_width
+            bar_height = value * self.height / self.max_value
+            RESOURCES.draw_label(painter, value, x, self.height - bar_height, bar_width, bar_height)
+            RESOURCES.draw_label(painter, i, x, self.height + 2, bar_width, 15)
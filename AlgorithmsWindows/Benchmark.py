@@ -0,0 +1,187 @@
+"""Headless benchmark for the step generators.
+
+Runs each algorithm's step generator without Qt across input sizes and
+distributions and reports wall time, comparisons, swaps and peak memory.
+
+    python Benchmark.py --sizes 10 1000 100000 --json results.json --csv results.csv
+"""
+import argparse, csv, json, sys, time, tracemalloc
+from functools import partial
+from itertools import islice
+
+from ArrayGenerator import DISTRIBUTIONS, generate_array
+from StepEngines import (bubble_sort_steps, insertion_sort_steps, selection_sort_steps,
+                         selection_sort_vectorized, quick_sort_steps, linear_search_steps,
+                         binary_search_steps, merge_sort_steps, heap_sort_steps)
+from StepTrace import COMPARE, SWAP, DONE, PROBE, RANGE, ROTATE, SCAN, MERGE
+
+
+def _search(steps, sort_input=False):
+    def run(arr):
+        if sort_input:
+            arr.sort()
+        # Search for the largest value, as the visualizers do by default;
+        # an empty array has nothing to find
+        return steps(arr, max(arr, default=0))
+    return run
+
+
+# name -> (step generator factory, estimated cost for n elements in steps;
+# vectorized engines count roughly 1000 scanned elements as one step)
+ALGORITHMS = {
+    "bubble": (bubble_sort_steps, lambda n: n * n),
+    "insertion": (insertion_sort_steps, lambda n: n * n),
+    "insertion_binary": (partial(insertion_sort_steps, binary=True), lambda n: n * n),
+    "insertion_block": (partial(insertion_sort_steps, block_shift=True), lambda n: n * n // 2),
+    "insertion_binary_block": (partial(insertion_sort_steps, binary=True, block_shift=True),
+                               lambda n: n * max(n.bit_length(), 1)),
+    "selection": (selection_sort_steps, lambda n: n * n // 2),
+    "selection_double": (partial(selection_sort_steps, double_ended=True), lambda n: n * n // 2),
+    "selection_numpy": (selection_sort_vectorized, lambda n: n * n // 2000),
+    "selection_double_numpy": (partial(selection_sort_vectorized, double_ended=True),
+                               lambda n: n * n // 2000),
+    "quick": (quick_sort_steps, lambda n: 2 * n * max(n.bit_length(), 1)),
+    "quick_median3": (partial(quick_sort_steps, pivot_rule="median of three"),
+                      lambda n: 2 * n * max(n.bit_length(), 1)),
+    "quick_random": (partial(quick_sort_steps, pivot_rule="random", seed=0),
+                     lambda n: 2 * n * max(n.bit_length(), 1)),
+    "quick_hoare": (partial(quick_sort_steps, scheme="hoare", pivot_rule="median of three"),
+                    lambda n: 2 * n * max(n.bit_length(), 1)),
+    "merge": (merge_sort_steps, lambda n: n),
+    "merge_bottom_up": (partial(merge_sort_steps, bottom_up=True), lambda n: n),
+    "heap": (heap_sort_steps, lambda n: 3 * n * max(n.bit_length(), 1)),
+    "heap_insertion": (partial(heap_sort_steps, build="insertion"),
+                       lambda n: 3 * n * max(n.bit_length(), 1)),
+    "linear": (_search(linear_search_steps), lambda n: n),
+    "binary": (_search(binary_search_steps, sort_input=True), lambda n: max(n.bit_length(), 1)),
+}
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+FIELDS = ("algorithm", "distribution", "size", "status", "wall_time", "steps",
+          "comparisons", "swaps", "moves", "peak_memory")
+
+
+def count_steps(steps, limit=None):
+    """Exhaust a step generator (or stop after `limit` steps) and count its operations.
+
+    Moves counts elements shifted by one place: one per swap, the length
+    of the shifted block for a rotation and the merged range for a merge.
+    Comparisons made inside merges are taken from the DONE step.
+    """
+    total = comparisons = swaps = moves = 0
+    for op, a, b, _ in islice(steps, limit):
+        total += 1
+        if op == SWAP:
+            swaps += 1
+            moves += 1
+        elif op == ROTATE:
+            moves += b - a
+        elif op == MERGE:
+            moves += b - a + 1
+        elif op == DONE:
+            comparisons += a
+        elif op in (COMPARE, PROBE, RANGE):
+            comparisons += 1
+        elif op == SCAN:
+            # One vectorized pass over a..b compares every element to the best so far
+            comparisons += b - a
+    return total, comparisons, swaps, moves
+
+
+def run_case(name, size, distribution, seed=None, budget=20_000_000, memory=True):
+    factory, estimate = ALGORITHMS[name]
+    result = dict.fromkeys(FIELDS)
+    result.update(algorithm=name, distribution=distribution, size=size)
+
+    # Skip cases expected to run far beyond the step budget; worst cases
+    # the estimate misses (e.g. quick sort on sorted input) are cut off
+    if estimate(size) > budget:
+        result["status"] = "skipped"
+        return result
+
+    array = generate_array(size, distribution, seed=seed).tolist()
+
+    work = array.copy()
+    start = time.perf_counter()
+    total, comparisons, swaps, moves = count_steps(factory(work), budget)
+    result["wall_time"] = time.perf_counter() - start
+    result.update(status="ok", steps=total, comparisons=comparisons, swaps=swaps, moves=moves)
+    if total >= budget:
+        result["status"] = "truncated"
+        return result
+
+    # Memory is measured in a second pass so tracing doesn't skew the timing
+    if memory:
+        work = array.copy()
+        tracemalloc.start()
+        count_steps(factory(work), budget)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmark(algorithms, sizes, distributions, seed=None, budget=20_000_000, memory=True):
+    for name in algorithms:
+        for distribution in distributions:
+            for size in sizes:
+                yield run_case(name, size, distribution, seed, budget, memory)
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def print_header(out=sys.stdout):
+    out.write(f"{'algorithm':<24} {'distribution':<14} {'size':>8} {'time (s)':>10} "
+              f"{'comparisons':>13} {'swaps':>12} {'moves':>12} {'peak mem':>10}\n")
+
+
+def print_row(r, out=sys.stdout):
+    if r["status"] == "skipped":
+        out.write(f"{r['algorithm']:<24} {r['distribution']:<14} {r['size']:>8} {'skipped':>10}\n")
+    else:
+        memory = "-" if r["peak_memory"] is None else f"{r['peak_memory'] // 1024}K"
+        status = " (truncated)" if r["status"] == "truncated" else ""
+        out.write(f"{r['algorithm']:<24} {r['distribution']:<14} {r['size']:>8} {r['wall_time']:>10.4f} "
+                  f"{r['comparisons']:>13} {r['swaps']:>12} {r['moves']:>12} {memory:>10}{status}\n")
+    out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the algorithm step generators")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=int, default=20_000_000,
+                        help="skip cases estimated to take more steps than this")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--json", help="write results as JSON to this path")
+    parser.add_argument("--csv", help="write results as CSV to this path")
+    args = parser.parse_args(argv)
+
+    # Rows are printed as they complete
+    print_header()
+    results = []
+    for result in run_benchmark(args.algorithms, args.sizes, args.distributions,
+                                args.seed, args.budget, not args.no_memory):
+        print_row(result)
+        results.append(result)
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""Offline frame exporter.
+
+Renders every Nth step of a saved trace file (see TraceFile) to PNG frames
+without a display, and can assemble them into a GIF.
+
+    python Exporter.py run.trace frames --every 10 --size 800 400 --gif run.gif
+
+The frames are split into contiguous ranges over a process pool. Each
+worker memory-maps the trace, seeks to the checkpoint before its first
+frame and plays forward from there, so exports use every core. Workers
+never import Qt: frames are rasterised with NumPy and written as PNG
+with zlib. Assembling a GIF needs Pillow.
+"""
+import argparse, multiprocessing, os, struct, sys, zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from BarRaster import aggregate_columns, bar_pixels, column_ranks, column_starts, envelope_pixels
+from StepTrace import COMPARE, SWAP, PROBE, RANGE, PARTITION, ROTATE, SELECT, SCAN, MERGE, SIFT, apply_step
+from Theme import THEME_COLORS
+from TraceFile import MappedTrace
+
+CONTEXT = multiprocessing.get_context("spawn")
+
+# Same bar colors as race mode; states index into PALETTE
+EXPORT_COLORS = {
+    "default": "#4fc3f7",
+    "comparing": "#fbc02d",
+    "swapped": "#81c784",
+    "finished": "#1976d2",
+}
+
+
+def argb(color):
+    """Opaque ARGB32 value of a "#rrggbb" color"""
+    return 0xff000000 | int(color.lstrip("#"), 16)
+
+
+PALETTE = [argb(value) for value in EXPORT_COLORS.values()]
+DEFAULT, COMPARING, SWAPPED, FINISHED = range(len(PALETTE))
+BACKGROUND = argb(THEME_COLORS["background"])
+
+# Frames per pool task: smaller tasks balance better, larger ones seek less
+TASK_FRAMES = 64
+
+
+def frame_counts(total, every):
+    """Steps played before each frame: every `every` steps, always ending on the last"""
+    counts = list(range(0, total + 1, every))
+    if counts[-1] != total:
+        counts.append(total)
+    return counts
+
+
+def frame_path(out_dir, index):
+    return os.path.join(out_dir, f"frame_{index:06d}.png")
+
+
+def write_png(path, pixels):
+    """Write ARGB32 pixels (height x width uint32) as an RGB PNG"""
+    height, width = pixels.shape
+    rgb = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rgb[:, 0] = 0  # no per-row filter
+    rgb[:, 1::3] = pixels >> 16
+    rgb[:, 2::3] = pixels >> 8
+    rgb[:, 3::3] = pixels
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(rgb.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def step_highlight(step):
+    """Color state and bars highlighted after `step`"""
+    op, a, b, tag = step
+    if op == SWAP:
+        return SWAPPED, (a, b)
+    if op == ROTATE:
+        return SWAPPED, (a,)
+    if op == MERGE:
+        return SWAPPED, range(a, b + 1)
+    if op == COMPARE:
+        return COMPARING, (a, b)
+    if op in (PROBE, SIFT):
+        return COMPARING, (a,)
+    if op == SELECT:
+        return COMPARING, (a, b) if b >= 0 else (a,)
+    if op in (RANGE, PARTITION, SCAN):
+        return COMPARING, (tag,)
+    return DEFAULT, ()
+
+
+def render_frame(values, last_step, finished, width, height, max_value):
+    """ARGB pixels for one frame; past `width` elements columns show their envelope"""
+    n = len(values)
+    states = np.full(n, FINISHED if finished else DEFAULT, dtype=np.uint8)
+    if last_step is not None and not finished:
+        state, indices = step_highlight(last_step)
+        states[[i for i in indices if 0 <= i < n]] = state
+
+    if n <= width:
+        return bar_pixels(values, states, PALETTE, BACKGROUND, width, height, max_value)
+
+    starts = column_starts(n, width)
+    col_min, col_max, col_sum, col_rank = aggregate_columns(values, column_ranks(states, DEFAULT), starts)
+    colors = np.array(PALETTE, dtype=np.uint32)[np.where(col_rank < 0, DEFAULT, col_rank)]
+    return envelope_pixels(col_min, col_sum // np.diff(np.append(starts, n)), col_max,
+                           colors, BACKGROUND, height, max_value)
+
+
+def render_frames(path, counts, first, out_dir, width, height):
+    """Worker: render the frames after each of `counts` steps as frame `first` onwards"""
+    trace = MappedTrace(path)
+    max_value = max(max(trace.initial, default=1), 1)
+
+    # Seek once, then play forward through the range
+    position, state, _ = trace.checkpoint(counts[0])
+    values = np.array(state, dtype=np.int64)
+    for k, count in enumerate(counts):
+        while position < count:
+            apply_step(values, trace.step(position))
+            position += 1
+        last_step = trace.step(count - 1) if count > 0 else None
+        pixels = render_frame(values, last_step, count == len(trace), width, height, max_value)
+        write_png(frame_path(out_dir, first + k), pixels)
+    trace.close()
+    return len(counts)
+
+
+def write_gif(out_dir, count, path, fps):
+    """Assemble frames 0..count-1 into an animated GIF (needs Pillow)"""
+    from PIL import Image
+
+    frames = (Image.open(frame_path(out_dir, k)) for k in range(1, count))
+    Image.open(frame_path(out_dir, 0)).save(path, save_all=True, append_images=frames,
+                                            duration=round(1000 / fps), loop=0)
+
+
+def export(path, out_dir, every=1, width=800, height=400, workers=None, gif=None, fps=30):
+    """Render a trace file to a PNG sequence in `out_dir`, and a GIF if `gif` is set"""
+    trace = MappedTrace(path)
+    total = len(trace)
+    trace.close()
+
+    counts = frame_counts(total, every)
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(workers, mp_context=CONTEXT) as pool:
+        tasks = [pool.submit(render_frames, path, counts[first:first + TASK_FRAMES], first, out_dir, width, height)
+                 for first in range(0, len(counts), TASK_FRAMES)]
+        done = 0
+        for task in as_completed(tasks):
+            done += task.result()
+            print(f"\rRendered {done}/{len(counts)} frames", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    if gif:
+        write_gif(out_dir, len(counts), gif, fps)
+    return len(counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a trace file to PNG frames or a GIF")
+    parser.add_argument("trace", help="trace file saved from a visualizer window")
+    parser.add_argument("out_dir", help="directory for the PNG frames")
+    parser.add_argument("--every", type=int, default=1, help="render one frame every N steps")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 400), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--gif", metavar="PATH", help="also assemble the frames into a GIF (needs Pillow)")
+    parser.add_argument("--fps", type=float, default=30)
+    args = parser.parse_args(argv)
+
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    if args.gif:
+        try:
+            import PIL
+        except ImportError:
+            parser.error("--gif needs Pillow, install it with: pip install Pillow")
+    try:
+        count = export(args.trace, args.out_dir, args.every, *args.size, args.workers, args.gif, args.fps)
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {count} frames to {args.out_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+from PyQt5.QtGui import (QOpenGLContext, QOpenGLBuffer, QOpenGLShader, QOpenGLShaderProgram,
+                         QOpenGLVersionProfile, QMatrix4x4, QPaintEngine)
+import numpy as np
+
+
+# Above this many bars the vertex buffer gets too big and the raster image is used
+GL_BAR_LIMIT = 100000
+
+GL_TRIANGLES = 0x0004
+GL_FLOAT = 0x1406
+
+# Per vertex: element index, right-edge flag, value, then r, g, b
+VERTEX_FLOATS = 6
+VERTEX_BYTES = VERTEX_FLOATS * 4
+BAR_BYTES = 6 * VERTEX_BYTES
+
+# Two triangles per bar as (right-edge flag, top flag) corners
+CORNERS = np.array([(0, 0), (1, 0), (1, 1), (0, 0), (1, 1), (0, 1)], dtype=np.float32)
+
+VERTEX_SHADER = """
+attribute highp vec3 bar;
+attribute lowp vec3 color;
+uniform highp mat4 matrix;
+uniform highp float gap;
+varying lowp vec3 v_color;
+void main() {
+    gl_Position = matrix * vec4(bar.x + bar.y * (1.0 - gap), bar.z, 0.0, 1.0);
+    v_color = color;
+}
+"""
+
+FRAGMENT_SHADER = """
+varying lowp vec3 v_color;
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+
+_available = None
+
+
+def opengl_available():
+    """Whether an OpenGL context can be created at all, e.g. not on offscreen platforms"""
+    global _available
+    if _available is None:
+        _available = QOpenGLContext().create()
+    return _available
+
+
+def uses_opengl(painter):
+    engine = painter.paintEngine()
+    return engine is not None and engine.type() == QPaintEngine.OpenGL2
+
+
+class GLBarBuffer:
+    """Vertex buffer drawing a BatchedBarItem's bars in an OpenGL viewport.
+
+    Every bar is one quad in a single vertex buffer, in array-index and
+    value units, so resizing only changes the matrix uniform. Bars changed
+    since the last frame are written back in place; the whole buffer is only
+    uploaded again after a full refresh. GL 2.0 has no instanced drawing,
+    so each quad carries its own six vertices.
+    """
+
+    def __init__(self, n):
+        self.vertices = np.zeros((n, 6, VERTEX_FLOATS), dtype=np.float32)
+        self.vertices[:, :, 0] = np.arange(n, dtype=np.float32)[:, None]
+        self.vertices[:, :, 1] = CORNERS[:, 0]
+        self.context = None
+        self.functions = None
+        self.program = None
+        self.buffer = None
+        self.dirty = set()
+        self.upload_all = True
+
+    def mark(self, i):
+        self.dirty.add(i)
+
+    def mark_all(self):
+        self.dirty.clear()
+        self.upload_all = True
+
+    def _create(self):
+        self.context = QOpenGLContext.currentContext()
+        profile = QOpenGLVersionProfile()
+        profile.setVersion(2, 0)
+        self.functions = self.context.versionFunctions(profile)
+        self.functions.initializeOpenGLFunctions()
+
+        self.program = QOpenGLShaderProgram()
+        self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, VERTEX_SHADER)
+        self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, FRAGMENT_SHADER)
+        self.program.bindAttributeLocation("bar", 0)
+        self.program.bindAttributeLocation("color", 1)
+        self.program.link()
+
+        self.buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self.buffer.create()
+        self.buffer.setUsagePattern(QOpenGLBuffer.DynamicDraw)
+        self.upload_all = True
+
+    def update(self, values, color_index, palette):
+        """Rebuild the vertices of the changed bars; returns their indices, or None for all"""
+        n = len(self.vertices)
+        whole = self.upload_all or len(self.dirty) > n // 4
+        indices = np.arange(n) if whole else np.fromiter(self.dirty, np.int64, len(self.dirty))
+        self.dirty.clear()
+        self.upload_all = False
+
+        bars = self.vertices[indices]
+        bars[:, :, 2] = values[indices].astype(np.float32)[:, None] * CORNERS[:, 1]
+        colors = np.array(palette, dtype=np.uint32)[color_index[indices]]
+        for channel, shift in enumerate((16, 8, 0)):
+            bars[:, :, 3 + channel] = (((colors >> shift) & 0xff) / 255.0)[:, None]
+        self.vertices[indices] = bars
+        return None if whole else indices
+
+    def _upload(self, indices):
+        if indices is None:
+            self.buffer.allocate(self.vertices, self.vertices.nbytes)
+            return
+        for i in indices.tolist():
+            self.buffer.write(i * BAR_BYTES, self.vertices[i], BAR_BYTES)
+
+    def draw(self, painter, item):
+        """Draw a BatchedBarItem's bars into its rectangle"""
+        n = len(self.vertices)
+        width, height = item.width, item.height
+        if QOpenGLContext.currentContext() is not self.context:
+            self._create()
+
+        # Item coordinates to the viewport's clip space, bars in index and value units
+        device = painter.device()
+        matrix = QMatrix4x4()
+        matrix.ortho(0, device.width(), device.height(), 0, -1, 1)
+        matrix = matrix * QMatrix4x4(painter.deviceTransform())
+        matrix.translate(0, height)
+        matrix.scale(width / n, -height / item.max_value)
+
+        # Keep a 1px gap while bars are wide, as the raster path does
+        gap = n / width if width >= 4 * n else 0.0
+
+        painter.beginNativePainting()
+        self.program.bind()
+        self.program.setUniformValue("matrix", matrix)
+        self.program.setUniformValue("gap", float(gap))
+        self.buffer.bind()
+        self._upload(self.update(item.values, item.color_index, item.palette))
+        self.program.enableAttributeArray(0)
+        self.program.enableAttributeArray(1)
+        self.program.setAttributeBuffer(0, GL_FLOAT, 0, 3, VERTEX_BYTES)
+        self.program.setAttributeBuffer(1, GL_FLOAT, 3 * 4, 3, VERTEX_BYTES)
+        self.functions.glDrawArrays(GL_TRIANGLES, 0, 6 * n)
+        self.program.disableAttributeArray(0)
+        self.program.disableAttributeArray(1)
+        self.buffer.release()
+        self.program.release()
+        painter.endNativePainting()
@@ -0,0 +1,165 @@
+from PyQt5.QtWidgets import QApplication, QLabel, QComboBox, QFrame, QGraphicsView, QGraphicsScene
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+import sys
+
+from HeapTree import HeapTree
+from StepEngines import HEAP_BUILDS, heap_sort_steps
+from StepTrace import COMPARE, SWAP, SIFT, apply_step
+from Visualizer import Visualizer
+
+
+class HeapSort(Visualizer):
+    title = "Heap Sort Visualizer"
+    COLORS = {
+        "comparing": "#fbc02d",
+        "path": "#ba68c8",
+        "sorted": "#1976d2",
+        "swapped": "#81c784",
+    }
+    STATE = ("building", "heap_size", "path", "active",
+             "build_comparisons", "build_swaps", "sort_comparisons", "sort_swaps")
+
+    def reset_algorithm(self):
+        self.building = True
+        self.heap_size = len(self.array)
+        self.path = ()
+        self.active = ()
+        self.build_comparisons = 0
+        self.build_swaps = 0
+        self.sort_comparisons = 0
+        self.sort_swaps = 0
+
+    def add_controls(self, layout):
+        # Floyd's bottom-up heapify or one insertion per element
+        build_label = QLabel("Build:")
+        self.build_input = QComboBox()
+        self.build_input.addItems(HEAP_BUILDS)
+
+        layout.addWidget(build_label)
+        layout.addWidget(self.build_input)
+        self.extra_controls.append(self.build_input)
+
+    def add_counters(self):
+        self.build_counter = self.add_counter("Build: 0 comparisons, 0 swaps")
+        self.sort_counter = self.add_counter("Sort: 0 comparisons, 0 swaps")
+
+    def add_views(self, layout):
+        # The same array as a binary tree, beside the bars
+        self.tree_scene = QGraphicsScene()
+        self.tree_scene.setBackgroundBrush(self.colors["background"])
+        self.tree_view = QGraphicsView(self.tree_scene)
+        self.tree_view.setRenderHint(QPainter.Antialiasing)
+        self.tree_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.tree_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.tree_view.setFrameShape(QFrame.NoFrame)
+        self.tree = HeapTree(self.tree_scene, self.tree_view, self.color_states, self.palette)
+
+        layout.setStretchFactor(self.view, 1)
+        layout.addWidget(self.tree_view, 1)
+
+    def update_counters(self):
+        # Per element, Floyd's build cost stays constant while insertion's grows with log n
+        per_element = self.build_comparisons / max(len(self.array), 1)
+        self.build_counter.setText(f"Build: {self.build_comparisons} comparisons, "
+                                   f"{self.build_swaps} swaps ({per_element:.2f} per element)")
+        self.sort_counter.setText(f"Sort: {self.sort_comparisons} comparisons, {self.sort_swaps} swaps")
+
+    def trace_params(self):
+        return (self.build_input.currentText(),)
+
+    def load_trace_params(self, params):
+        self.build_input.setCurrentText(params[0])
+
+    def step_generator(self):
+        return heap_sort_steps(self.array.copy(), self.build_input.currentText())
+
+    def draw_array(self):
+        super().draw_array()
+        self.tree.set_array(self.array)
+
+    def redraw(self, dirty, states=None):
+        # The bars and the tree share one set of color states per frame
+        if states is None:
+            states = self.color_states()
+        super().redraw(dirty, states)
+        if dirty is None:
+            self.tree.refresh(states)
+        else:
+            self.tree.update_nodes(dirty, states)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.tree.resized()
+
+    def color_states(self):
+        if self.complete:
+            return self.fill_states("swapped")
+        states = self.fill_states("default")
+        if self.running:
+            # Behind the heap: sorted, or not yet inserted while building
+            states[self.heap_size:] = self.color_slot["dimmed" if self.building else "sorted"]
+            self.mark(states, self.path, "path")
+            self.mark(states, self.active, "comparing")
+        return states
+
+    def handle_step(self, step):
+        # Nodes highlighted by the previous step
+        dirty = set(self.active)
+        dirty.update(self.path)
+
+        op, a, b, tag = step
+        if op == SIFT:
+            # Bars entering or leaving the heap change color; the first
+            # insertion shrinks the heap to two elements
+            if abs(b - self.heap_size) > len(self.array) // 4:
+                dirty = None
+            else:
+                dirty.update(range(min(b, self.heap_size), max(b, self.heap_size)))
+            self.building = not tag
+            self.heap_size = b
+            self.path = (a,)
+            self.active = ()
+            if self.building and a == b - 1:
+                self.message = f"Inserting element {a} and sifting it up"
+            else:
+                self.message = f"Sifting down from index {a} in a heap of {b}"
+            if dirty is None:
+                return None
+        elif op == COMPARE:
+            if self.building:
+                self.build_comparisons += 1
+            else:
+                self.sort_comparisons += 1
+            self.active = (a, b)
+            self.message = f"Comparing elements at indices {a} and {b}"
+        elif op == SWAP:
+            apply_step(self.array, step)
+            self.active = (a, b)
+            if b == tag:
+                # Largest element moves behind the shrinking heap
+                self.building = False
+                self.heap_size = tag
+                self.path = ()
+                self.message = f"Moving the maximum {self.array[b]} to index {b}"
+            else:
+                # The sift path follows the moved element
+                self.path += (b if self.path[-1] == a else a,)
+                self.message = f"Swapping elements at indices {a} and {b}"
+            if self.building:
+                self.build_swaps += 1
+            else:
+                self.sort_swaps += 1
+        else:
+            self.complete = True
+            self.message = "Sorting complete!"
+            return None
+
+        return dirty | set(self.active) | set(self.path)
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    window = HeapSort()
+    window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,164 @@
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsLineItem
+from PyQt5.QtCore import QTimer, QRectF
+from PyQt5.QtGui import QColor, QTransform
+
+from BarScene import RESIZE_SETTLE_MS
+from PaintResources import BAR_OUTLINE, LABEL_FONT, LABEL_PEN, RESOURCES
+
+
+# Nodes drawn in the tree view: the first nine levels of the heap
+TREE_NODE_LIMIT = 511
+
+MAX_NODE_SIZE = 40
+EDGE_PEN = RESOURCES.pen(QColor("#646464"))
+
+
+class TreeNodeItem(QGraphicsItem):
+    """One heap node, drawn as a circle centered on its position"""
+
+    def __init__(self, value, parent=None):
+        super().__init__(parent)
+        self.value = value
+        self.size = 0
+        self.color = QColor("#4fc3f7")
+        self.brush = RESOURCES.brush(self.color)
+        self.show_label = True
+        self.setZValue(1)
+
+    def boundingRect(self):
+        return QRectF(-self.size / 2, -self.size / 2, self.size, self.size)
+
+    def set_size(self, size):
+        self.prepareGeometryChange()
+        self.size = size
+
+    def set_value(self, value):
+        if value != self.value:
+            self.value = value
+            self.update()
+
+    def set_color(self, color):
+        if color != self.color:
+            self.color = color
+            self.brush = RESOURCES.brush(color)
+            self.update()
+
+    def paint(self, painter, option, widget):
+        painter.setPen(BAR_OUTLINE)
+        painter.setBrush(self.brush)
+        half = self.size / 2
+        painter.drawEllipse(QRectF(-half, -half, self.size, self.size))
+        if self.show_label:
+            painter.setPen(LABEL_PEN)
+            painter.setFont(LABEL_FONT)
+            RESOURCES.draw_label(painter, self.value, -half, -half, self.size, self.size)
+
+
+class HeapTree:
+    """Retained binary-tree view of an array laid out as a heap.
+
+    Node i has children 2i + 1 and 2i + 2. Node items and the edges between
+    them are created and positioned once per array; after that a step only
+    updates the value and colour of the nodes it touched, so a sift redraws
+    just the nodes on its path. Only the first TREE_NODE_LIMIT nodes are
+    shown.
+
+    `color_states` and `palette` work as in BarScene, so the tree can share
+    the bar view's color states. Call resized() from the
+    owner's resizeEvent.
+    """
+
+    def __init__(self, scene, view, color_states, palette):
+        self.scene = scene
+        self.view = view
+        self.color_states = color_states
+        self.palette = palette
+        self.array = []
+        self.nodes = []
+        self.edges = []
+
+        self.layout_size = None
+        self.settle_timer = QTimer()
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.layout)
+
+    def set_array(self, array):
+        """Rebuild the node and edge items for a new array"""
+        self.scene.clear()
+        self.array = array
+        self.nodes = []
+        self.edges = []
+
+        for i in range(min(len(array), TREE_NODE_LIMIT)):
+            node = TreeNodeItem(array[i])
+            self.nodes.append(node)
+            self.scene.addItem(node)
+            if i > 0:
+                edge = QGraphicsLineItem()
+                edge.setPen(EDGE_PEN)
+                self.edges.append(edge)
+                self.scene.addItem(edge)
+        self.layout()
+
+    def layout(self):
+        """Position every node and edge, e.g. after a resize"""
+        self.settle_timer.stop()
+        self.view.resetTransform()
+        if not self.nodes:
+            self.layout_size = None
+            return
+
+        width = self.view.width() - 20
+        height = self.view.height() - 20
+        self.layout_size = (width, height) if width > 0 and height > 0 else None
+        levels = len(self.nodes).bit_length()
+        level_height = height / levels
+        size = max(min(MAX_NODE_SIZE, level_height * 0.7, width / 2 ** (levels - 1) * 0.9), 1)
+        show_label = size - 2 >= RESOURCES.text(max(self.array), LABEL_FONT).size().width()
+
+        # Level d holds nodes 2^d - 1 .. 2^(d+1) - 2, spread evenly across the width
+        positions = []
+        for i, node in enumerate(self.nodes):
+            level = (i + 1).bit_length() - 1
+            slot = i + 1 - 2 ** level
+            x = (slot + 0.5) * width / 2 ** level
+            y = (level + 0.5) * level_height
+            positions.append((x, y))
+            node.set_size(size)
+            node.show_label = show_label
+            node.setPos(x, y)
+        for i, edge in enumerate(self.edges, start=1):
+            parent = positions[(i - 1) // 2]
+            edge.setLine(*parent, *positions[i])
+
+        self.scene.setSceneRect(0, 0, width, height)
+        self.refresh()
+
+    def resized(self):
+        """Stretch the tree to the new view size now and lay it out once resizing stops"""
+        if self.layout_size is not None:
+            width, height = self.layout_size
+            scale_x = max(self.view.width() - 20, 1) / width
+            scale_y = max(self.view.height() - 20, 1) / height
+            self.view.setTransform(QTransform.fromScale(scale_x, scale_y))
+        self.settle_timer.start()
+
+    def update_nodes(self, indices, states=None):
+        """Update only the nodes at `indices`, colored from `states` if given"""
+        if states is None:
+            states = self.color_states()
+        count = len(self.nodes)
+        for i in indices:
+            if 0 <= i < count:
+                node = self.nodes[i]
+                node.set_value(self.array[i])
+                node.set_color(self.palette[states[i]])
+
+    def refresh(self, states=None):
+        """Update every node, e.g. when the whole color state changes"""
+        if states is None:
+            states = self.color_states()
+        for i, node in enumerate(self.nodes):
+            node.set_value(self.array[i])
+            node.set_color(self.palette[states[i]])
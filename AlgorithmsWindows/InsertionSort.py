@@ -1,22 +1,115 @@
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                           QHBoxLayout, QPushButton, QLabel, QLineEdit, QFrame,
-                           QGraphicsView, QGraphicsScene, QGraphicsItem, QSpinBox)
-from PyQt5.QtCore import Qt, QTimer, QRectF
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPalette
-import random, sys
+from PyQt5.QtWidgets import QApplication, QLabel, QComboBox, QCheckBox
+import sys
 
+from StepEngines import insertion_sort_steps
+from StepTrace import COMPARE, SWAP, DONE, ROTATE, apply_step
+from Visualizer import Visualizer
 
 
-class BarItem(QGraphicsItem):
-    pass
+class InsertionSort(Visualizer):
+    title = "Insertion Sort Visualizer"
+    COLORS = {
+        "comparing": "#fbc02d",
+        "key": "#e57373",
+        "sorted": "#1976d2",
+        "swapped": "#81c784",
+    }
+    STATE = ("i", "key", "active", "comparisons", "moves")
 
+    def reset_algorithm(self):
+        self.i = 0
+        self.key = -1
+        self.active = ()
+        self.comparisons = 0
+        self.moves = 0
 
-class InsertionSort(QMainWindow):
-    pass
+    def add_controls(self, layout):
+        # Slot search and shifting mode
+        search_label = QLabel("Slot Search:")
+        self.search_input = QComboBox()
+        self.search_input.addItems(("linear", "binary"))
+
+        self.block_shift_input = QCheckBox("Block Shift")
+
+        layout.addWidget(search_label)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.block_shift_input)
+        self.extra_controls += [self.search_input, self.block_shift_input]
+
+    def add_counters(self):
+        self.comparisons_counter = self.add_counter("Comparisons: 0")
+        self.moves_counter = self.add_counter("Moves: 0")
+
+    def update_counters(self):
+        self.comparisons_counter.setText(f"Comparisons: {self.comparisons}")
+        self.moves_counter.setText(f"Moves: {self.moves}")
+
+    def trace_params(self):
+        return self.search_input.currentText(), self.block_shift_input.isChecked()
+
+    def load_trace_params(self, params):
+        self.search_input.setCurrentText(params[0])
+        self.block_shift_input.setChecked(params[1])
+
+    def step_generator(self):
+        return insertion_sort_steps(self.array.copy(),
+                                    self.search_input.currentText() == "binary",
+                                    self.block_shift_input.isChecked())
+
+    def color_states(self):
+        if self.complete:
+            return self.fill_states("swapped")
+        states = self.fill_states("default")
+        if self.running:
+            states[:self.i + 1] = self.color_slot["sorted"]
+            self.mark(states, self.active, "comparing")
+            self.mark(states, (self.key,), "key")
+        return states
+
+    def handle_step(self, step):
+        # Bars highlighted by the previous step
+        dirty = set(self.active)
+        dirty.add(self.key)
+
+        op, a, b, tag = step
+        if tag != self.i and op != DONE:
+            # Next key: the sorted prefix grows up to it
+            dirty.update(range(self.i, tag + 1))
+            self.i = tag
+            self.key = tag
+
+        if op == COMPARE:
+            self.comparisons += 1
+            self.active = (a, b)
+            self.message = f"Comparing key {self.array[self.key]} with element at index {a}"
+        elif op == SWAP:
+            self.moves += 1
+            apply_step(self.array, step)
+            self.active = (a, b)
+
+            # Follow the key as it moves down
+            self.key = a if self.key == b else self.key
+            self.message = f"Moving key {self.array[self.key]} down to index {self.key}"
+        elif op == ROTATE:
+            # The whole block shifts right by one in a single step
+            self.moves += b - a
+            apply_step(self.array, step)
+            self.active = ()
+            self.key = a
+            dirty.update(range(a, b + 1))
+            self.message = f"Shifting indices {a}..{b - 1} right and inserting key {self.array[a]} at {a}"
+        elif op == DONE:
+            self.complete = True
+            self.message = "Sorting complete!"
+            return None
+
+        dirty.update(self.active)
+        dirty.add(self.key)
+        return dirty
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = InsertionSort()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -0,0 +1,50 @@
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton
+import importlib
+
+
+# Display name -> (module, window class); modules are imported on first open
+ALGORITHMS = {
+    "Bubble Sort": ("BubbleSort", "BubbleSort"),
+    "Insertion Sort": ("InsertionSort", "InsertionSort"),
+    "Selection Sort": ("SelectionSort", "SelectionSort"),
+    "Quick Sort": ("QuickSort", "QuickSort"),
+    "Merge Sort": ("MergeSort", "MergeSort"),
+    "Heap Sort": ("HeapSort", "HeapSort"),
+    "Linear Search": ("LinearSearch", "LinearSearch"),
+    "Binary Search": ("BinarySearch", "BinarySearch"),
+    "Race Mode": ("Race", "Race"),
+}
+
+
+class Launcher(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Algorithm Visualizer")
+        self.windows = {}
+        
+        # One button per algorithm
+        main_widget = QWidget()
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.addWidget(QLabel("Choose an algorithm:"))
+        
+        for name in ALGORITHMS:
+            button = QPushButton(name)
+            button.clicked.connect(lambda checked, name=name: self.open_algorithm(name))
+            layout.addWidget(button)
+            
+        main_widget.setLayout(layout)
+        self.setCentralWidget(main_widget)
+        
+    def open_algorithm(self, name):
+        # Import the module the first time its window is opened
+        window = self.windows.get(name)
+        if window is None:
+            module_name, class_name = ALGORITHMS[name]
+            module = importlib.import_module(module_name)
+            window = getattr(module, class_name)()
+            self.windows[name] = window
+        window.show()
+        window.raise_()
+        window.activateWindow()
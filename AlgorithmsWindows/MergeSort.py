@@ -0,0 +1,156 @@
+from PyQt5.QtWidgets import QApplication, QLabel, QComboBox, QFrame, QGraphicsView, QGraphicsScene
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+import sys
+
+from BarScene import BarScene
+from StepEngines import MERGE_VARIANTS, merge_sort_steps
+from StepTrace import MERGE, merge_runs
+from Visualizer import BarItem, Visualizer
+
+
+class MergeSort(Visualizer):
+    title = "Merge Sort Visualizer"
+    COLORS = {
+        "merged": "#81c784",
+        "left_run": "#fbc02d",
+        "right_run": "#e57373",
+        "swapped": "#1976d2",
+    }
+    STATE = ("low", "mid", "high", "aux_runs", "merges", "comparisons", "writes")
+
+    def reset_algorithm(self):
+        self.low = -1
+        self.mid = -1
+        self.high = -1
+        self.aux_runs = ()
+        self.merges = 0
+        self.comparisons = 0
+        self.writes = 0
+        # Auxiliary buffer: the runs of the current merge, empty elsewhere
+        self.aux = [0] * len(self.array)
+
+    def add_controls(self, layout):
+        # Recursive or iterative merging
+        variant_label = QLabel("Variant:")
+        self.variant_input = QComboBox()
+        self.variant_input.addItems(MERGE_VARIANTS)
+
+        layout.addWidget(variant_label)
+        layout.addWidget(self.variant_input)
+        self.extra_controls.append(self.variant_input)
+
+    def add_counters(self):
+        self.merges_counter = self.add_counter("Merges: 0")
+        self.comparisons_counter = self.add_counter("Comparisons: 0")
+        self.writes_counter = self.add_counter("Writes: 0")
+
+    def add_views(self, layout):
+        # Second row of bars for the auxiliary buffer, on the same scale as the array
+        aux_label = QLabel("Auxiliary buffer")
+        aux_label.setStyleSheet(f"color: {self.colors['text'].name()}; font-weight: bold;")
+
+        self.aux_scene = QGraphicsScene()
+        self.aux_scene.setBackgroundBrush(self.colors["background"])
+        self.aux_view = QGraphicsView(self.aux_scene)
+        self.aux_view.setRenderHint(QPainter.Antialiasing)
+        self.aux_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.aux_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.aux_view.setFrameShape(QFrame.NoFrame)
+        self.aux_bars = BarScene(self.aux_scene, self.aux_view, BarItem, self.aux_color_states, self.palette,
+                                 base_color=self.colors["dimmed"])
+
+        layout.setStretchFactor(self.view, 2)
+        layout.addWidget(aux_label)
+        layout.addWidget(self.aux_view, 1)
+
+    def update_counters(self):
+        self.merges_counter.setText(f"Merges: {self.merges}")
+        self.comparisons_counter.setText(f"Comparisons: {self.comparisons}")
+        self.writes_counter.setText(f"Writes: {self.writes}")
+
+    def trace_params(self):
+        return (self.variant_input.currentText(),)
+
+    def load_trace_params(self, params):
+        self.variant_input.setCurrentText(params[0])
+
+    def step_generator(self):
+        return merge_sort_steps(self.array.copy(), self.variant_input.currentText() == "bottom-up")
+
+    def restore_state(self, state):
+        super().restore_state(state)
+        # Rebuild the buffer from the saved runs; redraw() picks up the new list
+        self.aux = [0] * len(self.array)
+        if self.aux_runs:
+            self.aux[self.low:self.high + 1] = self.aux_runs
+
+    def draw_array(self):
+        super().draw_array()
+        # A new array starts with an empty buffer of the same length
+        if len(self.aux) != len(self.array):
+            self.aux = [0] * len(self.array)
+        self.aux_bars.set_array(self.aux, max(self.array, default=0))
+
+    def redraw(self, dirty, states=None):
+        super().redraw(dirty, states)
+        if self.aux_bars.array is not self.aux:
+            self.aux_bars.set_array(self.aux, max(self.array, default=0))
+        elif dirty is None:
+            self.aux_bars.refresh()
+        else:
+            self.aux_bars.update_bars(dirty)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.aux_bars.resized()
+
+    def color_states(self):
+        if self.complete:
+            return self.fill_states("swapped")
+        states = self.fill_states("default")
+        if self.running and self.low >= 0:
+            states[self.low:self.high + 1] = self.color_slot["merged"]
+        return states
+
+    def aux_color_states(self):
+        # The buffer holds the left and right runs of the current merge
+        states = self.fill_states("dimmed")
+        if self.running and not self.complete and self.low >= 0:
+            states[self.low:self.mid] = self.color_slot["left_run"]
+            states[self.mid:self.high + 1] = self.color_slot["right_run"]
+        return states
+
+    def handle_step(self, step):
+        # Bars of the previous merge lose their highlight
+        previous = (self.low, self.high)
+
+        op, a, b, tag = step
+        if op != MERGE:
+            self.complete = True
+            self.message = "Sorting complete!"
+            return None
+
+        # Copy the two runs into the buffer, then write the merged block back
+        if self.low >= 0:
+            self.aux[self.low:self.high + 1] = [0] * (self.high - self.low + 1)
+        self.aux_runs = tuple(self.array[a:b + 1])
+        self.aux[a:b + 1] = self.aux_runs
+        self.comparisons += merge_runs(self.array, a, tag, b)
+
+        self.low, self.mid, self.high = a, tag, b
+        self.merges += 1
+        self.writes += b - a + 1
+        self.message = f"Merged runs [{a}, {tag - 1}] and [{tag}, {b}]"
+
+        # Large merges repaint everything at once
+        if (previous[1] - previous[0]) + (b - a) > len(self.array) // 4:
+            return None
+        return set(range(previous[0], previous[1] + 1)) | set(range(a, b + 1))
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    window = MergeSort()
+    window.show()
+    sys.exit(app.exec_())
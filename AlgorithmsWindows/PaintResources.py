@@ -0,0 +1,72 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPen, QBrush, QFont, QStaticText, QTransform
+
+
+LABEL_COLOR = QColor("#e0e0e0")
+LABEL_POINT_SIZE = 8
+
+# Labels kept before the text cache starts over, e.g. after many new arrays
+TEXT_CACHE_LIMIT = 4096
+
+
+class PaintResources:
+    """Pens, brushes, fonts and label texts shared by every bar item.
+
+    Each is created once per color or size and reused on every repaint,
+    so painting a bar allocates no Qt objects. Label texts are cached as
+    QStaticText, laid out once per string and font.
+    """
+
+    def __init__(self):
+        self.pens = {}
+        self.brushes = {}
+        self.fonts = {}
+        self.texts = {}
+
+    def pen(self, color, width=1):
+        key = (color.rgba(), width)
+        pen = self.pens.get(key)
+        if pen is None:
+            pen = self.pens[key] = QPen(color, width)
+        return pen
+
+    def brush(self, color):
+        key = color.rgba()
+        brush = self.brushes.get(key)
+        if brush is None:
+            brush = self.brushes[key] = QBrush(color)
+        return brush
+
+    def font(self, point_size=LABEL_POINT_SIZE, bold=True):
+        key = (point_size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = QFont()
+            font.setPointSize(point_size)
+            font.setBold(bold)
+        return font
+
+    def text(self, value, font):
+        key = (value, font.pointSize(), font.bold())
+        text = self.texts.get(key)
+        if text is None:
+            if len(self.texts) >= TEXT_CACHE_LIMIT:
+                self.texts.clear()
+            text = self.texts[key] = QStaticText(str(value))
+            text.setTextFormat(Qt.PlainText)
+            text.prepare(QTransform(), font)
+        return text
+
+    def draw_label(self, painter, value, x, y, width, height):
+        """Draw `value` centered in the given box with the painter's current font"""
+        text = self.text(value, painter.font())
+        size = text.size()
+        painter.drawStaticText(int(x + (width - size.width()) / 2),
+                               int(y + (height - size.height()) / 2), text)
+
+
+# One cache for the whole process
+RESOURCES = PaintResources()
+BAR_OUTLINE = RESOURCES.pen(QColor(Qt.black))
+LABEL_PEN = RESOURCES.pen(LABEL_COLOR)
+LABEL_FONT = RESOURCES.font()
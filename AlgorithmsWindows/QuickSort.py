@@ -1,22 +1,120 @@
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                           QHBoxLayout, QPushButton, QLabel, QLineEdit, QFrame,
-                           QGraphicsView, QGraphicsScene, QGraphicsItem, QSpinBox)
-from PyQt5.QtCore import Qt, QTimer, QRectF
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPalette
-import random, sys
+from PyQt5.QtWidgets import QApplication, QLabel, QComboBox
+import sys
 
+from StepEngines import PARTITION_SCHEMES, PIVOT_RULES, quick_sort_steps
+from StepTrace import COMPARE, SWAP, DONE, PARTITION, apply_step
+from Visualizer import Visualizer
 
 
-class BarItem(QGraphicsItem):
-    pass
+class QuickSort(Visualizer):
+    title = "Quick Sort Visualizer"
+    COLORS = {
+        "comparing": "#fbc02d",
+        "pivot": "#e57373",
+        "swapped": "#81c784",
+    }
+    STATE = ("low", "high", "pivot", "active", "comparisons", "swaps")
 
+    def reset_algorithm(self):
+        self.low = 0
+        self.high = len(self.array) - 1
+        self.pivot = -1
+        self.active = ()
+        self.comparisons = 0
+        self.swaps = 0
 
-class InsertionSort(QMainWindow):
-    pass
+    def add_controls(self, layout):
+        # Partition scheme and pivot selection
+        scheme_label = QLabel("Partition:")
+        self.scheme_input = QComboBox()
+        self.scheme_input.addItems(PARTITION_SCHEMES)
+
+        pivot_label = QLabel("Pivot:")
+        self.pivot_input = QComboBox()
+        self.pivot_input.addItems(PIVOT_RULES)
+
+        layout.addWidget(scheme_label)
+        layout.addWidget(self.scheme_input)
+        layout.addWidget(pivot_label)
+        layout.addWidget(self.pivot_input)
+        self.extra_controls += [self.scheme_input, self.pivot_input]
+
+    def add_counters(self):
+        self.comparisons_counter = self.add_counter("Comparisons: 0")
+        self.swaps_counter = self.add_counter("Swaps: 0")
+
+    def update_counters(self):
+        self.comparisons_counter.setText(f"Comparisons: {self.comparisons}")
+        self.swaps_counter.setText(f"Swaps: {self.swaps}")
+
+    def trace_params(self):
+        return self.scheme_input.currentText(), self.pivot_input.currentText()
+
+    def cacheable(self):
+        # Random pivots give a different run every time
+        return self.pivot_input.currentText() != "random"
+
+    def load_trace_params(self, params):
+        self.scheme_input.setCurrentText(params[0])
+        self.pivot_input.setCurrentText(params[1])
+
+    def step_generator(self):
+        return quick_sort_steps(self.array.copy(),
+                                self.scheme_input.currentText(),
+                                self.pivot_input.currentText())
+
+    def color_states(self):
+        if self.complete:
+            return self.fill_states("swapped")
+        if not self.running:
+            return self.fill_states("default")
+        # Bars outside the partition being worked on are dimmed
+        states = self.fill_states("dimmed")
+        states[self.low:self.high + 1] = self.color_slot["default"]
+        self.mark(states, self.active, "comparing")
+        self.mark(states, (self.pivot,), "pivot")
+        return states
+
+    def handle_step(self, step):
+        # Bars highlighted by the previous step
+        dirty = set(self.active)
+        dirty.add(self.pivot)
+
+        op, a, b, tag = step
+        if op == PARTITION:
+            # New active range: bars entering or leaving it change color
+            dirty.update(range(self.low, self.high + 1))
+            dirty.update(range(a, b + 1))
+            self.low, self.high, self.pivot = a, b, tag
+            self.active = ()
+            self.message = f"Partitioning [{a}, {b}] around pivot {self.array[tag]} at index {tag}"
+        elif op == COMPARE:
+            self.comparisons += 1
+            self.active = (a, b)
+            self.message = f"Comparing elements at indices {a} and {b}"
+        elif op == SWAP:
+            self.swaps += 1
+            apply_step(self.array, step)
+            self.active = (a, b)
+
+            # Follow the pivot as it moves
+            if self.pivot == a:
+                self.pivot = b
+            elif self.pivot == b:
+                self.pivot = a
+            self.message = f"Swapping elements at indices {a} and {b}"
+        elif op == DONE:
+            self.complete = True
+            self.message = "Sorting complete!"
+            return None
+
+        dirty.update(self.active)
+        dirty.add(self.pivot)
+        return dirty
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    window = InsertionSort()
+    window = QuickSort()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -0,0 +1,370 @@
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+                           QGridLayout, QPushButton, QLabel, QFrame, QGraphicsView,
+                           QGraphicsScene, QComboBox)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QColor
+import multiprocessing, sys, time
+import numpy as np
+
+from BarScene import BarScene
+from RaceWorker import SORTS, feed_steps
+from StepStream import QueuedStepStream
+from StepTrace import COMPARE, SWAP, PARTITION, ROTATE, SELECT, SCAN, MERGE, SIFT, apply_step, merge_runs
+from Theme import apply_theme
+from Visualizer import BASE_COLORS, ArrayWindow, BarItem, frame_interval
+
+
+# Engines raced by default, one per pane
+DEFAULT_ENGINES = ("bubble", "insertion", "selection", "quick")
+
+# Chunks a worker may run ahead of its pane before it blocks
+QUEUE_CHUNKS = 32
+
+# Workers are spawned rather than forked from the Qt process
+CONTEXT = multiprocessing.get_context("spawn")
+
+RACE_COLORS = {
+    "comparing": "#fbc02d",
+    "swapped": "#81c784",
+    "finished": "#1976d2",
+}
+
+
+def step_cost(step):
+    """Race budget one step uses: a merge pays for every element it writes"""
+    op, a, b, _ = step
+    return b - a + 1 if op == MERGE else 1
+
+
+class RacePane(QFrame):
+    """One racing engine: its bars, counters and worker process"""
+
+    def __init__(self, colors, engine, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+        self.palette = list(colors.values())
+        self.color_slot = {name: k for k, name in enumerate(colors)}
+        self.array = []
+        self.worker = None
+        self.stream = None
+        self.reset_counters()
+
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setStyleSheet(f"background-color: {colors['panel_bg'].name()}; border-radius: 8px;")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        # Engine choice and counters
+        header = QHBoxLayout()
+        self.engine_input = QComboBox()
+        self.engine_input.addItems(SORTS)
+        self.engine_input.setCurrentText(engine)
+        self.place_label = QLabel("")
+        self.counter_label = QLabel("")
+        self.counter_label.setStyleSheet(f"color: {colors['text'].name()}; font-weight: bold;")
+        header.addWidget(self.engine_input)
+        header.addWidget(self.place_label)
+        header.addStretch()
+        header.addWidget(self.counter_label)
+
+        # Graphics view for visualization
+        self.scene = QGraphicsScene()
+        self.scene.setBackgroundBrush(colors["background"])
+        self.view = QGraphicsView(self.scene)
+        self.view.setRenderHint(QPainter.Antialiasing)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setFrameShape(QFrame.NoFrame)
+        self.bars = BarScene(self.scene, self.view, BarItem, self.color_states, self.palette,
+                             base_color=self.colors["default"])
+
+        layout.addLayout(header)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+        self.update_counters()
+
+    def reset_counters(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.moves = 0
+        self.steps = 0
+        self.credit = 0
+        self.active = ()
+        self.moved = False
+        self.finished = False
+
+    def update_counters(self):
+        self.counter_label.setText(f"Comparisons: {self.comparisons}  Swaps: {self.swaps}  "
+                                   f"Moves: {self.moves}  Steps: {self.steps}")
+
+    def load(self, array):
+        """Show a fresh copy of the race array"""
+        self.stop()
+        self.array = list(array)
+        self.reset_counters()
+        self.place_label.setText("")
+        self.bars.set_array(self.array)
+        self.update_counters()
+
+    def start(self):
+        steps = CONTEXT.Queue(QUEUE_CHUNKS)
+        self.worker = CONTEXT.Process(target=feed_steps,
+                                      args=(self.engine_input.currentText(), list(self.array), steps),
+                                      daemon=True)
+        self.stream = QueuedStepStream(steps)
+        self.worker.start()
+        self.engine_input.setEnabled(False)
+
+    def stop(self):
+        if self.worker is not None:
+            self.worker.terminate()
+            self.worker.join()
+            self.worker = None
+            self.stream = None
+        self.engine_input.setEnabled(True)
+
+    def color_states(self):
+        n = len(self.array)
+        if self.finished:
+            return np.full(n, self.color_slot["finished"], dtype=np.uint8)
+        states = np.full(n, self.color_slot["default"], dtype=np.uint8)
+        active = [i for i in self.active if 0 <= i < n]
+        states[active] = self.color_slot["swapped" if self.moved else "comparing"]
+        return states
+
+    def advance(self, count):
+        """Play queued steps worth `count` of step_cost() and redraw once.
+
+        A step costing more than the frame has left is still played and
+        its overdraft is taken from the next frames. Never blocks: if the
+        worker hasn't produced the steps yet the pane just plays fewer
+        this frame.
+        """
+        if self.finished or self.stream is None:
+            return
+        dirty = set(self.active)
+        self.credit += count
+        while self.credit > 0:
+            step = self.stream.next()
+            if step is None:
+                # Budget the worker couldn't fill is not carried over
+                self.credit = 0
+                break
+            dirty.update(self.play(step))
+            self.credit -= step_cost(step)
+
+        if not self.stream.has_next():
+            self.finished = True
+            self.engine_input.setEnabled(True)
+
+        self.update_counters()
+        if self.finished:
+            self.bars.refresh()
+        else:
+            dirty.update(self.active)
+            self.bars.update_bars(dirty)
+
+    def play(self, step):
+        """Count and apply one step, returning the extra bars it changed"""
+        op, a, b, tag = step
+        self.steps += 1
+        self.moved = False
+        if op == COMPARE:
+            self.comparisons += 1
+            self.active = (a, b)
+        elif op == SWAP:
+            self.swaps += 1
+            self.moves += 1
+            apply_step(self.array, step)
+            self.active = (a, b)
+            self.moved = True
+        elif op == ROTATE:
+            self.moves += b - a
+            apply_step(self.array, step)
+            self.active = (a,)
+            self.moved = True
+            return range(a, b + 1)
+        elif op == MERGE:
+            self.comparisons += merge_runs(self.array, a, tag, b)
+            self.moves += b - a + 1
+            self.active = (a, b)
+            self.moved = True
+            return range(a, b + 1)
+        elif op == SCAN:
+            # One vectorized pass over a..b
+            self.comparisons += b - a
+            self.active = (tag,)
+        elif op == SELECT:
+            self.active = (a, b) if b >= 0 else (a,)
+        elif op == PARTITION:
+            self.active = (tag,)
+        elif op == SIFT:
+            self.active = (a,)
+        return ()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.bars.resized()
+
+
+class Race(ArrayWindow):
+    """Races several sorts on the same array, one pane each.
+
+    Every engine runs in its own worker process and streams its steps
+    through a bounded queue. One frame clock plays the same number of
+    steps on every pane per frame, so the UI thread only ever applies
+    steps and redraws.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Race Mode")
+        self.setGeometry(100, 100, 1400, 900)
+
+        # Color scheme
+        self.colors = {name: QColor(value) for name, value in dict(BASE_COLORS, **RACE_COLORS).items()}
+
+        # Initialize variables
+        self.array = []
+        self.array_size = 100
+        self.speed = 5.0
+        self.places = []
+        self.frame_time = 0.0
+
+        # Setup UI; the theme is shared by every window in the process
+        self.setup_ui()
+        apply_theme(QApplication.instance())
+
+        # Frame clock for every pane
+        self.start_frame_clock()
+
+    def setup_ui(self):
+        # Main widget and layout
+        main_widget = QWidget()
+        main_layout = QVBoxLayout()
+        main_layout.setSpacing(15)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        # Control panel
+        control_panel = self.panel()
+        control_layout = QHBoxLayout()
+        control_layout.setSpacing(15)
+        control_layout.setContentsMargins(15, 15, 15, 15)
+
+        # Buttons
+        self.generate_btn = QPushButton("Generate Array")
+        self.generate_btn.clicked.connect(self.generate_array)
+
+        self.start_btn = QPushButton("Start Race")
+        self.start_btn.clicked.connect(self.start_race)
+        self.start_btn.setEnabled(False)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.clicked.connect(self.stop_race)
+        self.stop_btn.setEnabled(False)
+
+        # Add controls to layout; one speed for every pane keeps the race fair
+        self.add_array_controls(control_layout)
+        self.add_speed_input(control_layout)
+        control_layout.addWidget(self.generate_btn)
+        control_layout.addWidget(self.start_btn)
+        control_layout.addWidget(self.stop_btn)
+        control_panel.setLayout(control_layout)
+
+        # Status panel with the UI frame time
+        status_panel = self.status_panel()
+        self.frame_label = self.add_counter("Frame: 0.0 ms")
+
+        # Racing panes in a 2x2 grid
+        grid = QGridLayout()
+        grid.setSpacing(15)
+        self.panes = []
+        for k, engine in enumerate(DEFAULT_ENGINES):
+            pane = RacePane(self.colors, engine)
+            grid.addWidget(pane, k // 2, k % 2)
+            self.panes.append(pane)
+
+        # Add widgets to main layout
+        main_layout.addWidget(control_panel)
+        main_layout.addWidget(status_panel)
+        main_layout.addLayout(grid, 1)
+
+        main_widget.setLayout(main_layout)
+        self.setCentralWidget(main_widget)
+
+    def enable_controls(self, enable):
+        """Enable or disable the controls that can't change mid-race"""
+        self.enable_array_controls(enable)
+        self.generate_btn.setEnabled(enable)
+        self.start_btn.setEnabled(enable and bool(self.array))
+        self.stop_btn.setEnabled(not enable)
+
+    def generate_array(self):
+        array = self.new_array()
+        if array is None:
+            return
+
+        # Every pane races on a copy of the same array
+        self.array = array
+        for pane in self.panes:
+            pane.load(self.array)
+
+        self.status_label.setText("Array generated. Ready to race.")
+        self.enable_controls(True)
+
+    def start_race(self):
+        if not self.array:
+            return
+
+        # Restart every pane from the generated array
+        for pane in self.panes:
+            pane.load(self.array)
+            pane.start()
+        self.places = []
+        self.pending = 0.0
+        self.frame_time = 0.0
+
+        self.status_label.setText("Racing...")
+        self.enable_controls(False)
+        self.timer.start(frame_interval())
+
+    def stop_race(self):
+        self.timer.stop()
+        for pane in self.panes:
+            pane.stop()
+        self.status_label.setText("Race stopped.")
+        self.enable_controls(True)
+
+    def next_frame(self):
+        start = time.perf_counter()
+
+        count = self.due_steps()
+        if count:
+            for pane in self.panes:
+                was_finished = pane.finished
+                pane.advance(count)
+                if pane.finished and not was_finished:
+                    self.places.append(pane)
+                    pane.place_label.setText(f"#{len(self.places)}")
+
+        # Smoothed time the UI thread spends per frame
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frame_time = 0.9 * self.frame_time + 0.1 * elapsed
+        self.frame_label.setText(f"Frame: {self.frame_time:.1f} ms")
+
+        if len(self.places) == len(self.panes):
+            self.timer.stop()
+            winner = self.places[0].engine_input.currentText()
+            self.status_label.setText(f"Race complete! {winner} finished first.")
+            self.enable_controls(True)
+
+    def closeEvent(self, event):
+        self.stop_race()
+        super().closeEvent(event)
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    window = Race()
+    window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,29 @@
+"""Worker process for race mode.
+
+Each racing engine runs its step generator in its own process, so four
+engines never compete with the UI thread for the interpreter. This module
+is the process entry point and stays free of Qt so workers start quickly.
+"""
+from Benchmark import ALGORITHMS
+
+# Searches sort their input first, so only sorts race on a shared array
+SORTS = tuple(name for name in ALGORITHMS if name not in ("linear", "binary"))
+
+CHUNK_SIZE = 2048
+
+
+def feed_steps(name, array, out, chunk_size=CHUNK_SIZE):
+    """Run engine `name` on `array` and put its steps on `out` in chunks.
+
+    `out` is bounded, so a worker blocks once it is a few chunks ahead of
+    the pane drawing it. A None step marks the end of the run.
+    """
+    factory, _ = ALGORITHMS[name]
+    chunk = []
+    for step in factory(array):
+        chunk.append(step)
+        if len(chunk) == chunk_size:
+            out.put(chunk)
+            chunk = []
+    chunk.append(None)
+    out.put(chunk)
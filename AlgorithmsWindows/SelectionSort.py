@@ -1,22 +1,109 @@
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                           QHBoxLayout, QPushButton, QLabel, QLineEdit, QFrame,
-                           QGraphicsView, QGraphicsScene, QGraphicsItem, QSpinBox)
-from PyQt5.QtCore import Qt, QTimer, QRectF
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPalette
-import random, sys
+from PyQt5.QtWidgets import QApplication, QCheckBox
+import sys
 
+from StepEngines import selection_sort_steps
+from StepTrace import COMPARE, SWAP, DONE, SELECT, apply_step
+from Visualizer import Visualizer
 
 
-class BarItem(QGraphicsItem):
-    pass
+class SelectionSort(Visualizer):
+    title = "Selection Sort Visualizer"
+    COLORS = {
+        "comparing": "#fbc02d",
+        "minimum": "#e57373",
+        "maximum": "#ba68c8",
+        "sorted": "#1976d2",
+        "swapped": "#81c784",
+    }
+    STATE = ("low", "high", "smallest", "largest", "active", "comparisons", "swaps")
 
+    def reset_algorithm(self):
+        self.low = 0
+        self.high = len(self.array) - 1
+        self.smallest = -1
+        self.largest = -1
+        self.active = ()
+        self.comparisons = 0
+        self.swaps = 0
 
-class SelectionSort(QMainWindow):
-    pass
+    def add_controls(self, layout):
+        # Select the minimum only, or the minimum and maximum in one pass
+        self.double_ended_input = QCheckBox("Double Ended")
+        layout.addWidget(self.double_ended_input)
+        self.extra_controls.append(self.double_ended_input)
+
+    def add_counters(self):
+        self.comparisons_counter = self.add_counter("Comparisons: 0")
+        self.swaps_counter = self.add_counter("Swaps: 0")
+
+    def update_counters(self):
+        self.comparisons_counter.setText(f"Comparisons: {self.comparisons}")
+        self.swaps_counter.setText(f"Swaps: {self.swaps}")
+
+    def trace_params(self):
+        return (self.double_ended_input.isChecked(),)
+
+    def load_trace_params(self, params):
+        self.double_ended_input.setChecked(params[0])
+
+    def step_generator(self):
+        return selection_sort_steps(self.array.copy(), self.double_ended_input.isChecked())
+
+    def color_states(self):
+        if self.complete:
+            return self.fill_states("swapped")
+        if not self.running:
+            return self.fill_states("default")
+        # Bars outside [low, high] are already placed at either end
+        states = self.fill_states("sorted")
+        states[self.low:self.high + 1] = self.color_slot["default"]
+        self.mark(states, self.active, "comparing")
+        self.mark(states, (self.largest,), "maximum")
+        self.mark(states, (self.smallest,), "minimum")
+        return states
+
+    def handle_step(self, step):
+        # Bars highlighted by the previous step
+        dirty = set(self.active)
+        dirty.update((self.smallest, self.largest))
+
+        op, a, b, tag = step
+        if op == SELECT:
+            if tag != self.low:
+                # Next pass: the placed ends grow by one; only
+                # double-ended runs track a maximum (b >= 0)
+                high = len(self.array) - 1 - tag if b >= 0 else self.high
+                dirty.update(range(self.low, tag + 1))
+                dirty.update(range(high, self.high + 1))
+                self.low, self.high = tag, high
+            self.smallest, self.largest = a, b
+            self.active = ()
+            if b >= 0:
+                self.message = f"Current minimum {self.array[a]} at index {a}, maximum {self.array[b]} at index {b}"
+            else:
+                self.message = f"Current minimum {self.array[a]} at index {a}"
+        elif op == COMPARE:
+            self.comparisons += 1
+            self.active = (a,)
+            self.message = f"Scanning index {a}: comparing {self.array[a]} with {self.array[b]}"
+        elif op == SWAP:
+            self.swaps += 1
+            apply_step(self.array, step)
+            self.active = (a, b)
+            self.smallest = self.largest = -1
+            self.message = f"Placing {self.array[a]} at index {a}"
+        elif op == DONE:
+            self.complete = True
+            self.message = "Sorting complete!"
+            return None
+
+        dirty.update(self.active)
+        dirty.update((self.smallest, self.largest))
+        return dirty
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = SelectionSort()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
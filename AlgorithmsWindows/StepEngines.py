@@ -0,0 +1,374 @@
+"""Step generators for each algorithm.
+
+Every generator works on the list it is given (pass a copy to keep the
+original) and yields (op, a, b, tag) steps as defined in StepTrace, one
+at a time, so callers can consume them lazily.
+"""
+import random
+
+import numpy as np
+
+from StepTrace import COMPARE, SWAP, DONE, PROBE, RANGE, PARTITION, ROTATE, SELECT, SCAN, MERGE, SIFT, merge_runs
+
+
+def bubble_sort_steps(arr):
+    n = len(arr)
+    for i in range(n):
+        swapped = False
+        for j in range(0, n - i - 1):
+            yield (COMPARE, j, j + 1, i)
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                swapped = True
+                yield (SWAP, j, j + 1, i)
+        if not swapped:
+            break
+    yield (DONE, 0, 0, n)
+
+
+def linear_search_steps(arr, target):
+    # For linear search, we check each element in sequence
+    for i in range(len(arr)):
+        yield (PROBE, i, 0, 0)
+
+        # If we find the target, we can stop
+        if arr[i] == target:
+            break
+
+
+def binary_search_steps(arr, target):
+    left, right = 0, len(arr) - 1
+    mid = 0
+    while left <= right:
+        mid = (left + right) // 2
+        yield (RANGE, left, right, mid)
+
+        if arr[mid] == target:
+            return
+        elif arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+
+    # Not found: a final step showing the empty range
+    if arr:
+        yield (RANGE, left, right, mid)
+
+
+def insertion_sort_steps(arr, binary=False, block_shift=False):
+    """Insertion sort.
+
+    `binary` finds each slot with a binary search over the sorted prefix
+    instead of a linear scan. `block_shift` moves the key into its slot
+    with a single ROTATE step instead of one adjacent swap per element.
+    """
+    n = len(arr)
+    for i in range(1, n):
+        key = arr[i]
+        if binary:
+            low, high = 0, i
+            while low < high:
+                mid = (low + high) // 2
+                yield (COMPARE, mid, i, i)
+                if arr[mid] <= key:
+                    low = mid + 1
+                else:
+                    high = mid
+            slot = low
+        elif block_shift:
+            slot = i
+            while slot > 0:
+                yield (COMPARE, slot - 1, i, i)
+                if arr[slot - 1] <= key:
+                    break
+                slot -= 1
+        else:
+            # Classic: compare and swap the key down one place at a time
+            j = i
+            while j > 0:
+                yield (COMPARE, j - 1, j, i)
+                if arr[j - 1] <= arr[j]:
+                    break
+                arr[j - 1], arr[j] = arr[j], arr[j - 1]
+                yield (SWAP, j - 1, j, i)
+                j -= 1
+            continue
+
+        if slot == i:
+            continue
+        if block_shift:
+            arr[slot + 1:i + 1] = arr[slot:i]
+            arr[slot] = key
+            yield (ROTATE, slot, i, i)
+        else:
+            for j in range(i, slot, -1):
+                arr[j - 1], arr[j] = arr[j], arr[j - 1]
+                yield (SWAP, j - 1, j, i)
+    yield (DONE, 0, 0, n)
+
+
+def selection_sort_steps(arr, double_ended=False):
+    """Selection sort with a visible scan.
+
+    Every element of the unsorted range is compared against the current
+    minimum, and a SELECT step marks each new candidate. `double_ended`
+    also tracks the maximum in the same pass and places both ends.
+    """
+    n = len(arr)
+    low, high = 0, n - 1
+    while low < high:
+        smallest = low
+        largest = low if double_ended else -1
+        yield (SELECT, smallest, largest, low)
+        for j in range(low + 1, high + 1):
+            yield (COMPARE, j, smallest, low)
+            if arr[j] < arr[smallest]:
+                smallest = j
+                yield (SELECT, smallest, largest, low)
+            if double_ended:
+                yield (COMPARE, j, largest, low)
+                if arr[j] > arr[largest]:
+                    largest = j
+                    yield (SELECT, smallest, largest, low)
+
+        if smallest != low:
+            arr[low], arr[smallest] = arr[smallest], arr[low]
+            yield (SWAP, low, smallest, low)
+            # The maximum may just have been moved out of `low`
+            if largest == low:
+                largest = smallest
+        if double_ended:
+            if largest != high:
+                arr[high], arr[largest] = arr[largest], arr[high]
+                yield (SWAP, high, largest, low)
+            high -= 1
+        low += 1
+    yield (DONE, 0, 0, n)
+
+
+def selection_sort_vectorized(arr, double_ended=False):
+    """Headless selection sort that finds each pass's extremes with NumPy.
+
+    One SCAN step per extreme replaces the per-element comparisons of
+    selection_sort_steps, so the O(n^2) comparison work runs in argmin
+    and argmax instead of the interpreter.
+    """
+    values = np.array(arr)
+    n = len(values)
+    low, high = 0, n - 1
+    while low < high:
+        smallest = low + int(values[low:high + 1].argmin())
+        yield (SCAN, low, high, smallest)
+        if smallest != low:
+            values[low], values[smallest] = values[smallest], values[low]
+            yield (SWAP, low, smallest, low)
+        if double_ended:
+            largest = low + int(values[low:high + 1].argmax())
+            yield (SCAN, low, high, largest)
+            if largest != high:
+                values[high], values[largest] = values[largest], values[high]
+                yield (SWAP, high, largest, low)
+            high -= 1
+        low += 1
+    arr[:] = values.tolist()
+    yield (DONE, 0, 0, n)
+
+
+PARTITION_SCHEMES = ("lomuto", "hoare")
+PIVOT_RULES = ("last", "median of three", "random")
+
+
+def _choose_pivot(arr, low, high, rule, rng):
+    """Pick a pivot index in [low, high], yielding the comparisons it makes"""
+    if rule == "random":
+        return rng.randint(low, high)
+    if rule == "median of three" and high - low >= 2:
+        mid = (low + high) // 2
+        yield (COMPARE, low, mid, low)
+        if arr[low] > arr[mid]:
+            low, mid = mid, low
+        yield (COMPARE, mid, high, low)
+        if arr[mid] <= arr[high]:
+            return mid
+        yield (COMPARE, low, high, low)
+        return high if arr[low] <= arr[high] else low
+    return high
+
+
+def _lomuto(arr, low, high, pivot):
+    # Move the pivot to the end, then grow the "< pivot" prefix
+    if pivot != high:
+        arr[pivot], arr[high] = arr[high], arr[pivot]
+        yield (SWAP, pivot, high, low)
+    store = low
+    for j in range(low, high):
+        yield (COMPARE, j, high, low)
+        if arr[j] < arr[high]:
+            if j != store:
+                arr[store], arr[j] = arr[j], arr[store]
+                yield (SWAP, store, j, low)
+            store += 1
+    if store != high:
+        arr[store], arr[high] = arr[high], arr[store]
+        yield (SWAP, store, high, low)
+    # The pivot is in its final place at `store`
+    return store - 1, store + 1
+
+
+def _hoare(arr, low, high, pivot):
+    # Move the pivot to the front so both scans stop inside the range
+    if pivot != low:
+        arr[pivot], arr[low] = arr[low], arr[pivot]
+        yield (SWAP, pivot, low, low)
+    # Scans compare against the pivot element wherever the swaps move it
+    value = arr[low]
+    at = low
+    i, j = low - 1, high + 1
+    while True:
+        i += 1
+        yield (COMPARE, i, at, low)
+        while arr[i] < value:
+            i += 1
+            yield (COMPARE, i, at, low)
+        j -= 1
+        yield (COMPARE, j, at, low)
+        while arr[j] > value:
+            j -= 1
+            yield (COMPARE, j, at, low)
+        if i >= j:
+            return j, j + 1
+        arr[i], arr[j] = arr[j], arr[i]
+        yield (SWAP, i, j, low)
+        if at == i:
+            at = j
+        elif at == j:
+            at = i
+
+
+def quick_sort_steps(arr, scheme="lomuto", pivot_rule="last", seed=None):
+    """Iterative quick sort over an explicit stack of (low, high) ranges.
+
+    The smaller side is always processed first, so the stack never holds
+    more than O(log n) ranges and large inputs can't hit the recursion
+    limit. A PARTITION step announces each range and its chosen pivot.
+    """
+    rng = random.Random(seed)
+    partition = _hoare if scheme == "hoare" else _lomuto
+    stack = [(0, len(arr) - 1)]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+        pivot = yield from _choose_pivot(arr, low, high, pivot_rule, rng)
+        yield (PARTITION, low, high, pivot)
+        left_end, right_start = yield from partition(arr, low, high, pivot)
+
+        # Push the larger side first so the smaller one is handled next
+        left, right = (low, left_end), (right_start, high)
+        if left_end - low > high - right_start:
+            stack.append(left)
+            stack.append(right)
+        else:
+            stack.append(right)
+            stack.append(left)
+    yield (DONE, 0, 0, len(arr))
+
+
+MERGE_VARIANTS = ("top-down", "bottom-up")
+
+
+def merge_sort_steps(arr, bottom_up=False):
+    """Merge sort, one MERGE step per pair of runs merged.
+
+    Each merge is a two-pointer merge recorded as a single block write of
+    its range rather than per-element moves, so the trace holds n - 1
+    merges however large they get. Top-down splits ranges in half on an
+    explicit stack and merges them on the way back up; bottom-up merges
+    runs of width 1, 2, 4, ... across the whole array. The comparisons
+    the merges made are reported in the DONE step.
+    """
+    n = len(arr)
+    comparisons = 0
+    if bottom_up:
+        width = 1
+        while width < n:
+            for low in range(0, n - width, 2 * width):
+                high = min(low + 2 * width, n) - 1
+                comparisons += merge_runs(arr, low, low + width, high)
+                yield (MERGE, low, high, low + width)
+            width *= 2
+    else:
+        # (low, high, split) entries; split ranges are merged once both halves are sorted
+        stack = [(0, n - 1, False)]
+        while stack:
+            low, high, split = stack.pop()
+            if low >= high:
+                continue
+            mid = (low + high) // 2 + 1
+            if split:
+                comparisons += merge_runs(arr, low, mid, high)
+                yield (MERGE, low, high, mid)
+            else:
+                stack.append((low, high, True))
+                stack.append((mid, high, False))
+                stack.append((low, mid - 1, False))
+    yield (DONE, comparisons, 0, n)
+
+
+HEAP_BUILDS = ("floyd", "insertion")
+
+
+def _sift_down(arr, i, size):
+    # Move arr[i] down past its larger child until both children are smaller
+    while 2 * i + 1 < size:
+        child = 2 * i + 1
+        if child + 1 < size:
+            yield (COMPARE, child, child + 1, size)
+            if arr[child + 1] > arr[child]:
+                child += 1
+        yield (COMPARE, i, child, size)
+        if arr[child] <= arr[i]:
+            return
+        arr[i], arr[child] = arr[child], arr[i]
+        yield (SWAP, i, child, size)
+        i = child
+
+
+def _sift_up(arr, i):
+    # Move arr[i] up while it is larger than its parent
+    size = i + 1
+    while i > 0:
+        parent = (i - 1) // 2
+        yield (COMPARE, parent, i, size)
+        if arr[parent] >= arr[i]:
+            return
+        arr[parent], arr[i] = arr[i], arr[parent]
+        yield (SWAP, parent, i, size)
+        i = parent
+
+
+def heap_sort_steps(arr, build="floyd"):
+    """Heap sort on a max-heap, with a SIFT step before every sift.
+
+    The heap is built either bottom-up (Floyd), sifting down every parent
+    from the last one to the root in O(n), or by inserting the elements
+    one at a time and sifting each up in O(n log n). The largest element
+    is then swapped behind the heap and the root sifted down, n - 1 times.
+    Compare and swap steps carry the heap size in their tag.
+    """
+    n = len(arr)
+    if build == "insertion":
+        for i in range(1, n):
+            yield (SIFT, i, i + 1, 0)
+            yield from _sift_up(arr, i)
+    else:
+        for i in range(n // 2 - 1, -1, -1):
+            yield (SIFT, i, n, 0)
+            yield from _sift_down(arr, i, n)
+
+    for end in range(n - 1, 0, -1):
+        arr[0], arr[end] = arr[end], arr[0]
+        yield (SWAP, 0, end, end)
+        yield (SIFT, 0, end, 1)
+        yield from _sift_down(arr, 0, end)
+    yield (DONE, 0, 0, n)
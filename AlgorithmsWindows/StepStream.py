@@ -0,0 +1,50 @@
+from queue import Empty
+
+
+class EmptyStepStream:
+    """Stream for a run whose steps are all recorded already, e.g. a cached trace"""
+
+    def has_next(self):
+        return False
+
+    def next(self):
+        return None
+
+
+class QueuedStepStream:
+    """Reads steps that a worker puts on `queue` in chunks.
+
+    next() never waits: it returns None while the worker hasn't caught up,
+    and has_next() only turns False once the worker's end marker (a None
+    step) is reached.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.chunk = []
+        self.position = 0
+        self.exhausted = False
+        self.consumed = 0
+
+    def _fill(self):
+        if self.position == len(self.chunk) and not self.exhausted:
+            try:
+                self.chunk = self.queue.get_nowait()
+            except Empty:
+                return
+            self.position = 0
+
+    def has_next(self):
+        self._fill()
+        if self.position < len(self.chunk) and self.chunk[self.position] is None:
+            self.exhausted = True
+        return not self.exhausted
+
+    def next(self):
+        """Return the next step, or None if none is ready yet or the run is over"""
+        if not self.has_next() or self.position == len(self.chunk):
+            return None
+        step = self.chunk[self.position]
+        self.position += 1
+        self.consumed += 1
+        return step
@@ -0,0 +1,142 @@
+from array import array
+
+
+# Step operations
+COMPARE = 0
+SWAP = 1
+DONE = 2    # tag = n, a = comparisons made inside block steps (merges)
+PROBE = 3   # a = probed index
+RANGE = 4   # a = left, b = right, tag = mid
+PARTITION = 5   # a = low, b = high, tag = pivot index
+ROTATE = 6  # arr[b] moves to a, arr[a..b-1] shift right by one
+SELECT = 7  # a = current minimum, b = current maximum (or -1), tag = pass start
+SCAN = 8    # a..b scanned in one vector operation, tag = index found
+MERGE = 9   # sorted runs a..tag-1 and tag..b merged into a..b in one block write
+SIFT = 10   # a sift starts at node a of a heap of b elements, tag = 1 once the heap is being sorted
+
+
+def merge_runs(arr, low, mid, high):
+    """Merge the sorted runs arr[low:mid] and arr[mid:high + 1] in place.
+
+    A stable two-pointer merge; returns the number of comparisons made.
+    Works on lists, arrays and NumPy arrays alike.
+    """
+    left = list(arr[low:mid])
+    i, j, k = 0, mid, low
+    comparisons = 0
+    while i < len(left) and j <= high:
+        comparisons += 1
+        if arr[j] < left[i]:
+            arr[k] = arr[j]
+            j += 1
+        else:
+            arr[k] = left[i]
+            i += 1
+        k += 1
+    # What is left of the right run is already in place
+    for value in left[i:]:
+        arr[k] = value
+        k += 1
+    return comparisons
+
+
+def apply_step(arr, step):
+    """Apply the array delta of one (op, a, b, tag) step in place"""
+    op, a, b, tag = step
+    if op == SWAP:
+        arr[a], arr[b] = arr[b], arr[a]
+    elif op == ROTATE:
+        value = arr[b]
+        arr[a + 1:b + 1] = arr[a:b]
+        arr[a] = value
+    elif op == MERGE:
+        merge_runs(arr, a, tag, b)
+
+
+class StepTrace:
+    """Compact step trace: one fixed-width (op, a, b, tag) record per step.
+
+    Only the operation and its indices are stored. The array state at any
+    step is rebuilt from the nearest checkpoint by replaying deltas, so
+    memory grows with the number of steps rather than steps * n.
+    """
+
+    def __init__(self, initial, checkpoint_interval=1024):
+        self.initial = list(initial)
+        # Keep checkpoint memory within a constant factor of the step count
+        self.checkpoint_interval = max(checkpoint_interval, len(self.initial), 1)
+        self.ops = array('b')
+        self.a = array('q')
+        self.b = array('q')
+        self.tags = array('q')
+        self.checkpoints = {}
+        self.contexts = {}
+        self._state = list(self.initial)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def _record(self, op, a, b, tag, context=None):
+        index = len(self.ops)
+        if index % self.checkpoint_interval == 0:
+            # Array state before this step
+            self.checkpoints[index] = array('q', self._state)
+            if context is not None:
+                self.contexts[index] = context()
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.tags.append(tag)
+        self.apply(self._state, index)
+
+    def append(self, step, context=None):
+        """Record an (op, a, b, tag) step.
+
+        `context` is called whenever a checkpoint is taken and its result is
+        kept with it, so callers can save their own state before the step.
+        """
+        op, a, b, tag = step
+        self._record(op, a, b, tag, context)
+
+    def compare(self, a, b, tag=0):
+        self._record(COMPARE, a, b, tag)
+
+    def swap(self, a, b, tag=0):
+        self._record(SWAP, a, b, tag)
+
+    def done(self, tag=0):
+        self._record(DONE, 0, 0, tag)
+
+    def step(self, index):
+        return self.ops[index], self.a[index], self.b[index], self.tags[index]
+
+    def apply(self, arr, index):
+        """Apply the delta of step `index` to `arr` in place"""
+        apply_step(arr, self.step(index))
+
+    def state_at(self, index):
+        """Return the array state after step `index` has been applied"""
+        if index < 0:
+            return list(self.initial)
+        start = index - index % self.checkpoint_interval
+        arr = list(self.checkpoints[start])
+        for k in range(start, index + 1):
+            self.apply(arr, k)
+        return arr
+
+    def checkpoint(self, index):
+        """Return (start, state, context) for the last checkpoint at or before step `index`"""
+        start = min(index, len(self.ops) - 1)
+        if start < 0:
+            return 0, list(self.initial), None
+        start -= start % self.checkpoint_interval
+        return start, list(self.checkpoints[start]), self.contexts.get(start)
+
+    def final_state(self):
+        return list(self._state)
+
+    def nbytes(self):
+        """Approximate memory held by the step records, checkpoints and states"""
+        records = sum(column.itemsize * len(column) for column in (self.ops, self.a, self.b, self.tags))
+        checkpoints = sum(state.itemsize * len(state) for state in self.checkpoints.values())
+        return records + checkpoints + 16 * len(self.initial)
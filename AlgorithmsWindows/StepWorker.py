@@ -0,0 +1,53 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import queue
+
+
+# Steps per queued chunk, and how many chunks the worker may run ahead
+CHUNK_SIZE = 1024
+MAX_CHUNKS = 64
+
+
+class StepWorker(QThread):
+    """Runs a step generator off the GUI thread.
+
+    Steps are handed over in chunks through a bounded queue (read it with
+    StepStream.QueuedStepStream), so the worker stays at most MAX_CHUNKS
+    ahead of playback. A None step marks the end of the run. `progress`
+    reports how many steps have been generated so far.
+    """
+
+    progress = pyqtSignal(int)
+
+    def __init__(self, steps, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS, parent=None):
+        super().__init__(parent)
+        self.steps = steps
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(max_chunks)
+        self.generated = 0
+
+    def run(self):
+        chunk = []
+        for step in self.steps:
+            chunk.append(step)
+            if len(chunk) == self.chunk_size:
+                if not self._put(chunk):
+                    return
+                chunk = []
+        self._put(chunk + [None])
+
+    def _put(self, chunk):
+        # Wait for room in the queue, but give up as soon as the run is cancelled
+        while not self.isInterruptionRequested():
+            try:
+                self.queue.put(chunk, timeout=0.05)
+            except queue.Full:
+                continue
+            self.generated += len(chunk) - (chunk[-1] is None)
+            self.progress.emit(self.generated)
+            return True
+        return False
+
+    def cancel(self):
+        """Stop generating and wait for the thread to finish"""
+        self.requestInterruption()
+        self.wait()
@@ -0,0 +1,109 @@
+# Colors shared by every visualizer window
+THEME_COLORS = {
+    "background": "#1e1e2f",
+    "text": "#e0e0e0",
+    "button": "#2d2d3f",
+    "button_text": "#e0e0e0",
+    "input_bg": "#2d2d3f",
+    "panel_bg": "#252538",
+}
+
+STYLESHEET = """
+    QMainWindow, QWidget {
+        background-color: #1e1e2f;
+        color: #e0e0e0;
+        font-size: 12pt;
+    }
+    QPushButton {
+        background-color: #2d2d3f;
+        color: #e0e0e0;
+        border: 1px solid #3d3d5f;
+        border-radius: 4px;
+        padding: 8px 16px;
+        font-weight: bold;
+        font-size: 12pt;
+    }
+    QPushButton:hover {
+        background-color: #3d3d5f;
+        border: 2px solid #4fc3f7;
+    }
+    QPushButton:pressed {
+        background-color: #4d4d6f;
+    }
+    QPushButton:disabled {
+        background-color: #1d1d2f;
+        color: #808080;
+        border: 1px solid #2d2d3f;
+    }
+    QLabel {
+        color: #e0e0e0;
+        font-size: 12pt;
+    }
+    QLineEdit, QSpinBox, QDoubleSpinBox {
+        background-color: #2d2d3f;
+        color: #e0e0e0;
+        border: 1px solid #3d3d5f;
+        border-radius: 4px;
+        padding: 6px;
+        font-size: 12pt;
+    }
+    QSpinBox::up-button, QSpinBox::down-button,
+    QDoubleSpinBox::up-button, QDoubleSpinBox::down-button {
+        width: 0px;
+        height: 0px;
+    }
+    QGraphicsView {
+        background-color: #1e1e2f;
+        border: 1px solid #3d3d5f;
+        border-radius: 4px;
+    }
+"""
+
+
+_palette = None
+
+
+def build_palette():
+    # Qt is imported here so THEME_COLORS can be read without it, e.g. by
+    # the exporter's worker processes
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QColor, QPalette
+
+    palette = QPalette()
+
+    # Set dark colors for the palette
+    palette.setColor(QPalette.Window, QColor(THEME_COLORS["background"]))
+    palette.setColor(QPalette.WindowText, QColor(THEME_COLORS["text"]))
+    palette.setColor(QPalette.Base, QColor(THEME_COLORS["input_bg"]))
+    palette.setColor(QPalette.AlternateBase, QColor(THEME_COLORS["panel_bg"]))
+    palette.setColor(QPalette.ToolTipBase, QColor(THEME_COLORS["background"]))
+    palette.setColor(QPalette.ToolTipText, QColor(THEME_COLORS["text"]))
+    palette.setColor(QPalette.Text, QColor(THEME_COLORS["text"]))
+    palette.setColor(QPalette.Button, QColor(THEME_COLORS["button"]))
+    palette.setColor(QPalette.ButtonText, QColor(THEME_COLORS["button_text"]))
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Link, QColor("#4fc3f7"))
+    palette.setColor(QPalette.Highlight, QColor("#1976d2"))
+    palette.setColor(QPalette.HighlightedText, QColor(THEME_COLORS["text"]))
+    return palette
+
+
+def theme_palette():
+    """The dark palette, built once per process"""
+    global _palette
+    if _palette is None:
+        _palette = build_palette()
+    return _palette
+
+
+def apply_theme(app):
+    """Set the application-wide dark theme.
+
+    Setting a stylesheet makes Qt re-parse it and re-polish every widget,
+    so it is done once per application; later windows inherit it.
+    """
+    if app.property("darkTheme"):
+        return
+    app.setPalette(theme_palette())
+    app.setStyleSheet(STYLESHEET)
+    app.setProperty("darkTheme", True)
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+import hashlib, os
+import numpy as np
+
+from TraceFile import MappedTrace, save_trace
+
+
+# Memory and (optional) disk budgets for finished traces
+MAX_BYTES = 256 * 1024 * 1024
+MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+# Disk entries are trace files under their own extension, so they aren't
+# mistaken for traces the user saved
+EXTENSION = ".tracecache"
+
+
+class TraceCache:
+    """Finished step traces keyed by (algorithm, input hash, options).
+
+    Replaying a run over the same array and options reuses its StepTrace
+    instead of generating the steps again. Entries are evicted least
+    recently used first once their total size passes `max_bytes`.
+
+    With a `directory`, traces are also written to disk as trace files
+    (see TraceFile), so they survive the window and the process. Disk files
+    are trimmed oldest first past `max_disk_bytes`, and a memory miss
+    falls back to them, memory-mapped.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, directory=None, max_disk_bytes=MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = None
+        self.entries = OrderedDict()
+        self.size = 0
+        if directory is not None:
+            self.set_directory(directory)
+
+    @staticmethod
+    def key(algorithm, array, params=()):
+        """Cache key for a run of `algorithm` over `array` with options `params`"""
+        digest = hashlib.blake2b(np.asarray(array, dtype=np.int64).tobytes(), digest_size=16).hexdigest()
+        return algorithm, digest, len(array), tuple(params)
+
+    def set_directory(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def get(self, key):
+        """Return the cached trace for `key`, or None"""
+        if key is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            trace = MappedTrace(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Treat it as a miss; the run regenerates and rewrites the trace
+            self._remove(path)
+            return None
+        self._insert(key, trace)
+        return trace
+
+    def put(self, key, trace):
+        """Cache a finished trace"""
+        if key is None:
+            return
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+        self._insert(key, trace)
+
+        path = self._path(key)
+        if path is not None and not os.path.exists(path):
+            # save_trace writes then renames, so a crash never leaves a
+            # half-written trace. A full or read-only directory only loses
+            # the disk copy.
+            try:
+                save_trace(path, trace, {"key": repr(key)})
+                self._trim_disk()
+            except OSError:
+                self._remove(path + ".tmp")
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def _insert(self, key, trace):
+        size = trace.nbytes()
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (trace, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+
+    def _path(self, key):
+        if self.directory is None:
+            return None
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + EXTENSION)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _trim_disk(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(EXTENSION):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+# Shared by every window in the process
+TRACE_CACHE = TraceCache()
@@ -0,0 +1,152 @@
+"""Binary trace files.
+
+A trace file holds one recorded run:
+
+    header       magic, version, array length n, step count,
+                 checkpoint interval and the offset of the footer
+    initial      n little-endian int64 values
+    blocks       one per checkpoint interval: the array state before the
+                 block's first step (n int64), then up to `interval`
+                 fixed-width (op, a, b, tag) records
+    footer       JSON with the run's metadata and each checkpoint's
+                 window state
+
+Every record and checkpoint sits at an offset computed from its index, so
+MappedTrace can memory-map the file and read any step without loading
+the others.
+"""
+import json, mmap, os, shutil, struct
+import numpy as np
+
+from StepTrace import apply_step
+
+
+MAGIC = b"ALGTRACE"
+VERSION = 1
+HEADER = struct.Struct("<8sIqqqq")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<bqqq")
+RECORD_DTYPE = np.dtype([("op", "<i1"), ("a", "<i8"), ("b", "<i8"), ("tag", "<i8")])
+
+
+def _encode(value):
+    # JSON fallback for window state: NumPy scalars and tuple-like values
+    if isinstance(value, np.generic):
+        return value.item()
+    return list(value)
+
+
+def _decode(context):
+    if context is None:
+        return None
+    return {name: tuple(value) if isinstance(value, list) else value for name, value in context.items()}
+
+
+def save_trace(path, trace, metadata=None):
+    """Write a StepTrace (or copy a MappedTrace) to the trace file `path`"""
+    if isinstance(trace, MappedTrace):
+        shutil.copyfile(trace.path, path)
+        return
+
+    n = len(trace.initial)
+    steps = len(trace)
+    interval = trace.checkpoint_interval
+    contexts = []
+
+    # Write to a temporary file and rename, so a failed save keeps the old file
+    with open(path + ".tmp", "wb") as f:
+        f.write(bytes(HEADER_SIZE))
+        f.write(np.asarray(trace.initial, dtype="<i8").tobytes())
+        for start in range(0, steps, interval):
+            end = min(start + interval, steps)
+            f.write(np.frombuffer(trace.checkpoints[start], dtype=np.int64).astype("<i8").tobytes())
+
+            # Slicing copies the columns, so the trace can keep growing afterwards
+            records = np.empty(end - start, dtype=RECORD_DTYPE)
+            records["op"] = np.frombuffer(trace.ops[start:end], dtype=np.int8)
+            records["a"] = np.frombuffer(trace.a[start:end], dtype=np.int64)
+            records["b"] = np.frombuffer(trace.b[start:end], dtype=np.int64)
+            records["tag"] = np.frombuffer(trace.tags[start:end], dtype=np.int64)
+            f.write(records.tobytes())
+            contexts.append(trace.contexts.get(start))
+
+        footer = f.tell()
+        f.write(json.dumps({"metadata": metadata or {}, "contexts": contexts}, default=_encode).encode())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, n, steps, interval, footer))
+    os.replace(path + ".tmp", path)
+
+
+class MappedTrace:
+    """Read-only StepTrace over a memory-mapped trace file.
+
+    Has the reading side of StepTrace (len, step, checkpoint, state_at),
+    so the timeline can play and seek it. Steps and checkpoints are read
+    from the mapping on demand; only the initial array and the footer are
+    loaded up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER_SIZE:
+            self.map.close()
+            raise ValueError(f"{path} is not a trace file")
+
+        magic, version, n, steps, interval, footer = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} trace file")
+
+        self.n = n
+        self.steps = steps
+        self.checkpoint_interval = interval
+        self.block_size = 8 * n + interval * RECORD.size
+        try:
+            footer = json.loads(self.map[footer:].decode())
+            self.metadata = footer["metadata"]
+            self.contexts = [_decode(context) for context in footer["contexts"]]
+            self.initial = np.frombuffer(self.map, dtype="<i8", count=n, offset=HEADER_SIZE).tolist()
+        except (ValueError, KeyError):
+            # Truncated or damaged file
+            self.map.close()
+            raise ValueError(f"{path} is a damaged trace file")
+
+    def __len__(self):
+        return self.steps
+
+    def _block_offset(self, block):
+        return HEADER_SIZE + 8 * self.n + block * self.block_size
+
+    def step(self, index):
+        block, position = divmod(index, self.checkpoint_interval)
+        return RECORD.unpack_from(self.map, self._block_offset(block) + 8 * self.n + position * RECORD.size)
+
+    def _state(self, block):
+        return np.frombuffer(self.map, dtype="<i8", count=self.n, offset=self._block_offset(block)).tolist()
+
+    def state_at(self, index):
+        """Return the array state after step `index` has been applied"""
+        if index < 0:
+            return list(self.initial)
+        start = index - index % self.checkpoint_interval
+        arr = self._state(start // self.checkpoint_interval)
+        for k in range(start, index + 1):
+            apply_step(arr, self.step(k))
+        return arr
+
+    def checkpoint(self, index):
+        """Return (start, state, context) for the last checkpoint at or before step `index`"""
+        start = min(index, self.steps - 1)
+        if start < 0:
+            return 0, list(self.initial), None
+        block = start // self.checkpoint_interval
+        return block * self.checkpoint_interval, self._state(block), self.contexts[block]
+
+    def nbytes(self):
+        """Size of the mapped file, the most it can page into memory"""
+        return len(self.map)
+
+    def close(self):
+        self.map.close()
@@ -0,0 +1,808 @@
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                           QHBoxLayout, QPushButton, QLabel, QLineEdit, QFrame,
+                           QGraphicsView, QGraphicsScene, QGraphicsItem, QSpinBox,
+                           QDoubleSpinBox, QAbstractSpinBox, QComboBox, QCheckBox,
+                           QSlider, QOpenGLWidget, QFileDialog)
+from PyQt5.QtCore import Qt, QTimer, QRectF
+from PyQt5.QtGui import QPainter, QColor
+import numpy as np
+
+from ArrayGenerator import DISTRIBUTIONS, generate_array
+from BarScene import BarScene
+from GLBars import opengl_available
+from PaintResources import BAR_OUTLINE, LABEL_FONT, LABEL_PEN, RESOURCES
+from StepStream import EmptyStepStream, QueuedStepStream
+from StepTrace import StepTrace
+from StepWorker import StepWorker
+from Theme import THEME_COLORS, apply_theme
+from TraceCache import TRACE_CACHE, TraceCache
+from TraceFile import MappedTrace, save_trace
+
+
+# Colors every visualizer uses; subclasses add their own in COLORS
+BASE_COLORS = dict(THEME_COLORS, **{
+    "default": "#4fc3f7",
+    "button_hover": "#3d3d5f",
+    "input_border": "#3d3d5f",
+    "dimmed": "#646464",
+})
+
+# Playback runs one frame per display refresh, falling back to ~60 fps
+DEFAULT_REFRESH_RATE = 60
+MAX_STEPS_PER_FRAME = 100000
+
+
+def frame_interval():
+    """Milliseconds between frames, matched to the screen refresh rate"""
+    screen = QApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0
+    return max(1, round(1000 / (rate or DEFAULT_REFRESH_RATE)))
+
+
+class BarItem(QGraphicsItem):
+    def __init__(self, value, index, width, height, parent=None):
+        super().__init__(parent)
+        self.value = value
+        self.index = index
+        self.width = width
+        self.height = height
+        self.color = QColor("#4fc3f7")  # Default color
+        self.brush = RESOURCES.brush(self.color)
+        self.show_labels = True
+        self.setAcceptHoverEvents(True)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width, self.height)
+
+    def set_geometry(self, value, width, height):
+        self.prepareGeometryChange()
+        self.value = value
+        self.width = width
+        self.height = height
+
+    def set_color(self, color):
+        if color != self.color:
+            self.color = color
+            self.brush = RESOURCES.brush(color)
+            self.update()
+
+    def paint(self, painter, option, widget):
+        painter.setPen(BAR_OUTLINE)
+        painter.setBrush(self.brush)
+        painter.drawRect(0, 0, int(self.width), int(self.height))
+
+        # Labels are dropped when the bar is narrower than the text
+        if not self.show_labels:
+            return
+
+        # Draw value and index text from the shared label cache
+        painter.setPen(LABEL_PEN)
+        painter.setFont(LABEL_FONT)
+        RESOURCES.draw_label(painter, self.value, 0, 0, self.width, self.height)
+        RESOURCES.draw_label(painter, self.index, 0, self.height + 2, self.width, 15)
+
+
+class ArrayWindow(QMainWindow):
+    """Window parts the visualizers and race mode share.
+
+    It builds the array inputs, speed input and status panel, generates
+    arrays from those inputs and paces steps over the frame clock. A
+    subclass sets `colors`, `array_size` and `speed` before calling its
+    setup_ui(), and implements next_frame().
+    """
+
+    def panel(self):
+        """A styled frame for one row of the window"""
+        frame = QFrame()
+        frame.setFrameShape(QFrame.StyledPanel)
+        frame.setStyleSheet(f"background-color: {self.colors['panel_bg'].name()}; border-radius: 8px;")
+        return frame
+
+    def add_array_controls(self, layout):
+        """Add the array size, distribution, duplicates and seed inputs to `layout`"""
+        # Array size input
+        size_label = QLabel("Array Size:")
+        self.size_input = QSpinBox()
+        self.size_input.setRange(5, 1000000)
+        self.size_input.setValue(self.array_size)
+        self.size_input.valueChanged.connect(self.update_array_size)
+
+        # Input distribution, duplicates and seed
+        distribution_label = QLabel("Distribution:")
+        self.distribution_input = QComboBox()
+        self.distribution_input.addItems(DISTRIBUTIONS)
+
+        self.duplicates_input = QCheckBox("Duplicates")
+
+        seed_label = QLabel("Seed:")
+        self.seed_input = QLineEdit()
+        self.seed_input.setPlaceholderText("Random")
+
+        layout.addWidget(size_label)
+        layout.addWidget(self.size_input)
+        layout.addWidget(distribution_label)
+        layout.addWidget(self.distribution_input)
+        layout.addWidget(self.duplicates_input)
+        layout.addWidget(seed_label)
+        layout.addWidget(self.seed_input)
+
+    def add_speed_input(self, layout):
+        """Add the steps per frame input to `layout`"""
+        # Fractions play one step every few frames
+        speed_label = QLabel("Steps/Frame:")
+        self.speed_input = QDoubleSpinBox()
+        self.speed_input.setDecimals(2)
+        self.speed_input.setRange(0.01, MAX_STEPS_PER_FRAME)
+        self.speed_input.setStepType(QAbstractSpinBox.AdaptiveDecimalStepType)
+        self.speed_input.setValue(self.speed)
+        self.speed_input.valueChanged.connect(self.update_speed)
+
+        layout.addWidget(speed_label)
+        layout.addWidget(self.speed_input)
+
+    def status_panel(self):
+        """Status panel with the status label; add_counter() adds labels after it"""
+        panel = self.panel()
+        self.status_layout = QHBoxLayout()
+        self.status_layout.setContentsMargins(15, 10, 15, 10)
+
+        self.status_label = QLabel("Ready to generate array")
+        self.status_label.setStyleSheet(f"color: {self.colors['text'].name()}; font-weight: bold;")
+
+        self.status_layout.addWidget(self.status_label)
+        self.status_layout.addStretch()
+        panel.setLayout(self.status_layout)
+        return panel
+
+    def add_counter(self, text):
+        """Add a counter label to the status panel"""
+        label = QLabel(text)
+        label.setStyleSheet(f"color: {self.colors['text'].name()}; font-weight: bold;")
+        self.status_layout.addWidget(label)
+        return label
+
+    def update_array_size(self, value):
+        self.array_size = value
+
+    def update_speed(self, value):
+        self.speed = value
+
+    def enable_array_controls(self, enable):
+        """Enable or disable the array inputs"""
+        self.size_input.setEnabled(enable)
+        self.distribution_input.setEnabled(enable)
+        self.duplicates_input.setEnabled(enable)
+        self.seed_input.setEnabled(enable)
+
+    def new_array(self):
+        """A new array from the inputs, or None after reporting an invalid seed"""
+        # Get seed from input, empty means a fresh random array
+        try:
+            seed = int(self.seed_input.text()) if self.seed_input.text() else None
+        except ValueError:
+            self.status_label.setText("Invalid seed. Please enter a number or leave it empty.")
+            return None
+
+        return generate_array(self.array_size,
+                              self.distribution_input.currentText(),
+                              self.duplicates_input.isChecked(),
+                              seed=seed).tolist()
+
+    def start_frame_clock(self):
+        """Create the frame clock that calls next_frame()"""
+        self.pending = 0.0
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.next_frame)
+
+    def due_steps(self):
+        """Whole steps due this frame at the current speed"""
+        # Fractional speeds accumulate until a whole step is due
+        self.pending += self.speed
+        count = int(self.pending)
+        self.pending -= count
+        return count
+
+
+class Visualizer(ArrayWindow):
+    """Base window for the algorithm visualizers.
+
+    It owns the controls, status panel, frame-paced playback and theme. An
+    algorithm plugs in by implementing:
+
+        step_generator()   a generator of (op, a, b, tag) steps over a copy of self.array
+        handle_step(step)  update the algorithm state for one step and return the bar
+                           indices it touched, or None to repaint every bar
+        color_states()     every bar's color in the current state, as a NumPy array
+                           of indices into self.palette built with range masks
+
+    and optionally the reset_algorithm, add_controls, add_counters,
+    update_counters, on_array_generated, prepare_start and on_finished hooks.
+
+    Steps are generated by a StepWorker thread, so the GUI never waits on
+    the algorithm, and recorded into a StepTrace so the timeline can seek.
+    STATE names the attributes handle_step changes; they are saved with
+    each trace checkpoint and restored when seeking.
+    """
+
+    title = "Algorithm Visualizer"
+    action = "sort"
+    default_speed = 0.05  # steps per frame
+    COLORS = {}
+    STATE = ()
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle(self.title)
+        self.setGeometry(100, 100, 1200, 800)
+
+        # Color scheme
+        self.colors = {name: QColor(value) for name, value in dict(BASE_COLORS, **self.COLORS).items()}
+        self.palette = list(self.colors.values())
+        self.color_slot = {name: k for k, name in enumerate(self.colors)}
+
+        # Initialize variables
+        self.array = []
+        self.array_size = 15
+        self.speed = self.default_speed
+        self.running = False
+        self.complete = False
+        self.current_step = 0
+        self.steps = None
+        self.worker = None
+        self.trace = None
+        self.trace_key = None
+        self.run_params = None
+        self.replay = None
+        self.message = ""
+        self.extra_controls = []
+        self.reset_algorithm()
+
+        # Setup UI; the theme is shared by every window in the process
+        self.setup_ui()
+        apply_theme(QApplication.instance())
+
+        # Frame clock for animation
+        self.start_frame_clock()
+        self.update_timeline()
+
+        # Stop the step worker before the application tears down
+        QApplication.instance().aboutToQuit.connect(self.cancel_worker)
+
+    # Algorithm hooks
+
+    def step_generator(self):
+        raise NotImplementedError
+
+    def handle_step(self, step):
+        raise NotImplementedError
+
+    def color_states(self):
+        return self.fill_states("default")
+
+    def fill_states(self, name):
+        """Color states with every bar set to color `name`"""
+        return np.full(len(self.array), self.color_slot[name], dtype=np.uint8)
+
+    def mark(self, states, indices, name):
+        """Set bars at `indices` to color `name`, skipping any outside the array"""
+        n = len(states)
+        states[[i for i in indices if 0 <= i < n]] = self.color_slot[name]
+
+    def reset_algorithm(self):
+        """Reset the algorithm-specific state"""
+
+    def add_controls(self, layout):
+        """Add algorithm options to the control panel (and self.extra_controls)"""
+
+    def add_counters(self):
+        """Create algorithm counters with add_counter()"""
+
+    def add_views(self, layout):
+        """Add views below the bars, e.g. a second row of bars"""
+
+    def update_counters(self):
+        """Refresh the algorithm counters from the current state"""
+
+    def on_array_generated(self):
+        """Adjust a freshly generated array, e.g. sort it for binary search"""
+
+    def prepare_start(self):
+        """Read run options before starting; return False to cancel"""
+        return True
+
+    def trace_params(self):
+        """Options the steps depend on besides the array, saved with the run's trace"""
+        return ()
+
+    def cacheable(self):
+        """Whether runs can be replayed from the trace cache; False if their steps are random"""
+        return True
+
+    def load_trace_params(self, params):
+        """Set the options from a loaded trace's trace_params()"""
+
+    def on_finished(self):
+        """Called once playback has run out of steps or completed"""
+
+    def save_state(self):
+        """Snapshot of the run state a checkpoint needs to resume from"""
+        state = {name: getattr(self, name) for name in self.STATE}
+        state["complete"] = self.complete
+        state["message"] = self.message
+        return state
+
+    def restore_state(self, state):
+        if state is None:
+            # Start of the run
+            self.reset_algorithm()
+            self.complete = False
+            self.message = "Start of the run"
+            return
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    # UI
+
+    def setup_ui(self):
+        # Main widget and layout
+        main_widget = QWidget()
+        main_layout = QVBoxLayout()
+        main_layout.setSpacing(15)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        # Control panel
+        control_panel = self.panel()
+        control_layout = QHBoxLayout()
+        control_layout.setSpacing(15)
+        control_layout.setContentsMargins(15, 15, 15, 15)
+
+        # Draw through an OpenGL viewport instead of the raster one
+        self.opengl_input = QCheckBox("OpenGL")
+        self.opengl_input.toggled.connect(self.set_opengl)
+
+        # Buttons
+        self.generate_btn = QPushButton("Generate Array")
+        self.generate_btn.clicked.connect(self.generate_array)
+
+        self.reset_btn = QPushButton("Reset")
+        self.reset_btn.clicked.connect(self.reset)
+
+        self.start_btn = QPushButton(f"Start {self.action.capitalize()}")
+        self.start_btn.clicked.connect(self.start)
+        self.start_btn.setEnabled(False)
+
+        # Add controls to layout
+        self.add_array_controls(control_layout)
+        self.add_controls(control_layout)
+        for control in self.extra_controls:
+            # Save Trace is only offered while the options match the recorded run
+            for signal in ("currentIndexChanged", "toggled"):
+                if hasattr(control, signal):
+                    getattr(control, signal).connect(self.update_timeline)
+        self.add_speed_input(control_layout)
+        control_layout.addWidget(self.opengl_input)
+        control_layout.addWidget(self.generate_btn)
+        control_layout.addWidget(self.reset_btn)
+        control_layout.addWidget(self.start_btn)
+        control_panel.setLayout(control_layout)
+
+        # Status panel with counters
+        status_panel = self.status_panel()
+        self.add_counters()
+        self.generated_counter = self.add_counter("Generated: 0")
+        self.steps_counter = self.add_counter("Steps: 0")
+
+        # Timeline over the recorded steps
+        timeline_panel = self.panel()
+        timeline_layout = QHBoxLayout()
+        timeline_layout.setSpacing(15)
+        timeline_layout.setContentsMargins(15, 10, 15, 10)
+
+        self.back_btn = QPushButton("Step Back")
+        self.back_btn.clicked.connect(self.step_back)
+
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+
+        self.forward_btn = QPushButton("Step Forward")
+        self.forward_btn.clicked.connect(self.step_forward)
+
+        # Seeks on release only, each seek replays from a checkpoint
+        self.timeline = QSlider(Qt.Horizontal)
+        self.timeline.setTracking(False)
+        self.timeline.setRange(0, 0)
+        self.timeline.valueChanged.connect(self.seek)
+
+        jump_label = QLabel("Step:")
+        self.jump_input = QSpinBox()
+        self.jump_input.setRange(0, 2147483647)
+
+        self.jump_btn = QPushButton("Jump")
+        self.jump_btn.clicked.connect(lambda: self.seek(self.jump_input.value()))
+
+        # Record the run to a trace file, or load one to replay
+        self.save_trace_btn = QPushButton("Save Trace")
+        self.save_trace_btn.clicked.connect(self.save_trace)
+
+        self.load_trace_btn = QPushButton("Load Trace")
+        self.load_trace_btn.clicked.connect(self.load_trace)
+
+        timeline_layout.addWidget(self.back_btn)
+        timeline_layout.addWidget(self.pause_btn)
+        timeline_layout.addWidget(self.forward_btn)
+        timeline_layout.addWidget(self.timeline)
+        timeline_layout.addWidget(jump_label)
+        timeline_layout.addWidget(self.jump_input)
+        timeline_layout.addWidget(self.jump_btn)
+        timeline_layout.addWidget(self.save_trace_btn)
+        timeline_layout.addWidget(self.load_trace_btn)
+        timeline_panel.setLayout(timeline_layout)
+        self.timeline_controls = [self.back_btn, self.pause_btn, self.forward_btn,
+                                  self.timeline, self.jump_input, self.jump_btn]
+
+        # Graphics view for visualization
+        self.scene = QGraphicsScene()
+        self.scene.setBackgroundBrush(self.colors["background"])
+        self.view = QGraphicsView(self.scene)
+        self.view.setRenderHint(QPainter.Antialiasing)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setFrameShape(QFrame.NoFrame)
+        self.bars = BarScene(self.scene, self.view, BarItem, self.color_states, self.palette,
+                             base_color=self.colors["default"])
+
+        # Add widgets to main layout
+        main_layout.addWidget(control_panel)
+        main_layout.addWidget(status_panel)
+        main_layout.addWidget(timeline_panel)
+        main_layout.addWidget(self.view)
+        self.add_views(main_layout)
+
+        main_widget.setLayout(main_layout)
+        self.setCentralWidget(main_widget)
+
+    def enable_controls(self, enable):
+        """Enable or disable all controls based on run state"""
+        self.enable_array_controls(enable)
+        self.speed_input.setEnabled(enable)
+        self.generate_btn.setEnabled(enable)
+        self.reset_btn.setEnabled(enable)
+        self.start_btn.setEnabled(enable)
+        self.load_trace_btn.setEnabled(enable)
+        for control in self.extra_controls:
+            control.setEnabled(enable)
+
+    # Array and run state
+
+    def generate_array(self):
+        array = self.new_array()
+        if array is None:
+            return
+
+        # Generate new array
+        self.replay = None
+        self.array = array
+        self.on_array_generated()
+
+        # Draw array and reset run state
+        self.draw_array()
+        self.reset_state()
+
+        # Update UI
+        self.status_label.setText(f"Array generated. Ready to {self.action}.")
+        self.enable_controls(True)
+
+    def draw_array(self):
+        self.bars.set_array(self.array)
+
+    def set_opengl(self, enabled):
+        if enabled and not opengl_available():
+            self.opengl_input.setChecked(False)
+            self.status_label.setText("OpenGL is not available, using the raster view")
+            return
+
+        # The bars are rebuilt as one batched item drawn from a vertex buffer
+        self.view.setViewport(QOpenGLWidget() if enabled else QWidget())
+        self.bars.opengl = enabled
+        self.draw_array()
+
+    def reset_state(self):
+        self.running = False
+        self.complete = False
+        self.current_step = 0
+        self.pending = 0.0
+        self.steps = None
+        self.trace = None
+        self.trace_key = None
+        self.run_params = None
+        self.cancel_worker()
+        self.reset_algorithm()
+        self.update_counters()
+        self.generated_counter.setText("Generated: 0")
+        self.steps_counter.setText("Steps: 0")
+
+        # Prepare steps for visualization
+        if self.array:
+            self.prepare_steps()
+        self.update_timeline()
+
+    def prepare_steps(self):
+        # Options this run's steps depend on, saved with its trace
+        self.run_params = self.trace_params()
+
+        # A loaded trace file is replayed while the input and options still match it
+        if self.replay is not None:
+            if self.replay_matches():
+                self.steps = EmptyStepStream()
+                self.trace = self.replay
+                self.generated_counter.setText(f"Generated: {len(self.trace)} (trace file)")
+                return
+            self.replay = None
+            self.status_label.setText("Input or options changed, the loaded trace is no longer replayed")
+
+        # A finished run over the same input is replayed from the cache
+        self.trace_key = None
+        if self.cacheable():
+            self.trace_key = TraceCache.key(type(self).__name__, self.array, self.run_params)
+        trace = TRACE_CACHE.get(self.trace_key)
+        if trace is not None:
+            self.steps = EmptyStepStream()
+            self.trace = trace
+            self.generated_counter.setText(f"Generated: {len(trace)} (cached)")
+            return
+
+        # Steps are generated in the background, playback starts with the
+        # first chunk and records steps as they are played
+        self.worker = StepWorker(self.step_generator())
+        self.worker.progress.connect(self.update_generated)
+        self.steps = QueuedStepStream(self.worker.queue)
+        self.trace = StepTrace(self.array)
+        self.worker.start()
+
+    def replay_matches(self):
+        return (list(self.run_params) == self.replay.metadata.get("params")
+                and self.array == self.replay.initial)
+
+    def save_trace(self):
+        if not self.trace_matches_options():
+            self.status_label.setText("Options changed since this run. Start a new run to save its trace.")
+            self.update_timeline()
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", f"{type(self).__name__}.trace",
+                                              "Trace files (*.trace)")
+        if not path:
+            return
+        metadata = {"algorithm": type(self).__name__, "params": list(self.run_params)}
+        try:
+            save_trace(path, self.trace, metadata)
+        except OSError as e:
+            self.status_label.setText(f"Could not save trace: {e}")
+            return
+        self.status_label.setText(f"Saved {len(self.trace)} steps to {path}")
+
+    def trace_matches_options(self):
+        """Whether the options still match the ones the recorded run used"""
+        return self.trace_params() == self.run_params
+
+    def load_trace(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Trace", "", "Trace files (*.trace)")
+        if not path:
+            return
+        try:
+            replay = MappedTrace(path)
+        except (OSError, ValueError) as e:
+            self.status_label.setText(f"Could not load trace: {e}")
+            return
+        if replay.metadata.get("algorithm") != type(self).__name__:
+            self.status_label.setText(f"Trace was recorded by {replay.metadata.get('algorithm')}, not {type(self).__name__}")
+            replay.close()
+            return
+
+        # Take the trace's input and options, then replay it like a cached run
+        self.timer.stop()
+        params = replay.metadata.get("params")
+        if params is not None:
+            self.load_trace_params(tuple(params))
+        self.replay = replay
+        self.array = list(replay.initial)
+        self.draw_array()
+        self.reset_state()
+        if self.replay is None:
+            # Options this window couldn't restore, e.g. a trace from an older version
+            self.status_label.setText(f"Trace options {params} don't match this window, "
+                                      f"its steps will be generated again")
+        else:
+            self.status_label.setText(f"Loaded {len(replay)} steps. Ready to {self.action}.")
+        self.enable_controls(True)
+
+    def cancel_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def update_generated(self, count):
+        # Progress still queued from a cancelled worker is ignored
+        if self.sender() is self.worker:
+            self.generated_counter.setText(f"Generated: {count}")
+
+    def reset(self):
+        self.timer.stop()
+        self.reset_state()
+        self.draw_array()
+        self.status_label.setText(f"{self.action.capitalize()} reset. Ready to {self.action}.")
+        self.enable_controls(True)
+
+    # Playback
+
+    def start(self):
+        if not self.array or not self.prepare_start():
+            return
+
+        # Reset run state and start
+        self.reset_state()
+        self.running = True
+        self.redraw(None)
+
+        # Disable controls during the run
+        self.enable_controls(False)
+
+        # Start the frame clock for animation
+        self.timer.start(frame_interval())
+        self.update_timeline()
+
+    def has_next_step(self):
+        return self.steps is not None and (self.current_step < len(self.trace) or self.steps.has_next())
+
+    def pull_step(self):
+        """Next step to play: replayed from the trace after a seek back,
+        otherwise pulled from the generator and recorded"""
+        if self.current_step < len(self.trace):
+            return self.trace.step(self.current_step)
+        step = self.steps.next()
+        if step is not None:
+            self.trace.append(step, self.save_state)
+        return step
+
+    def next_frame(self):
+        if not self.array or self.steps is None:
+            return
+
+        count = self.due_steps()
+        if count:
+            self.play_steps(count)
+
+    def play_steps(self, count):
+        """Apply up to `count` steps, then draw only the state they end in"""
+        dirty = set()
+        full_refresh = False
+        played = 0
+        while played < count and not self.complete:
+            step = self.pull_step()
+            if step is None:
+                break
+
+            touched = self.handle_step(step)
+            self.current_step += 1
+            played += 1
+            if touched is None:
+                full_refresh = True
+            elif not full_refresh:
+                dirty.update(touched)
+
+        if played:
+            # Update status and counters once per frame
+            self.update_status()
+
+            # Redraw only the bars these steps touched
+            self.redraw(None if full_refresh else dirty)
+
+        if self.complete or not self.has_next_step():
+            self.finish()
+        else:
+            self.update_timeline()
+
+    def redraw(self, dirty, states=None):
+        """Redraw the bars at `dirty`, or every bar if it is None.
+
+        `states` is this frame's color_states(); it is computed here when not given.
+        """
+        if states is None:
+            states = self.color_states()
+        if dirty is None:
+            self.bars.refresh(states)
+        else:
+            self.bars.update_bars(dirty, states)
+
+    def update_status(self):
+        self.status_label.setText(self.message)
+        self.update_counters()
+        self.steps_counter.setText(f"Steps: {self.current_step}")
+
+    def finish(self):
+        self.timer.stop()
+        self.on_finished()
+
+        # Keep the trace once every step has been generated and recorded
+        if not self.steps.has_next():
+            TRACE_CACHE.put(self.trace_key, self.trace)
+
+        # Enable controls when the run is complete
+        self.enable_controls(True)
+        self.update_timeline()
+
+    # Timeline
+
+    def update_timeline(self):
+        """Sync the timeline with the recorded steps and the current step"""
+        recorded = len(self.trace) if self.trace is not None else 0
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, recorded)
+        self.timeline.setValue(self.current_step)
+        self.timeline.blockSignals(False)
+
+        for control in self.timeline_controls:
+            control.setEnabled(self.running)
+        self.pause_btn.setEnabled(self.running and self.has_next_step())
+        self.pause_btn.setText("Pause" if self.timer.isActive() else "Resume")
+        self.save_trace_btn.setEnabled(recorded > 0 and not self.timer.isActive()
+                                       and self.trace_matches_options())
+
+    def toggle_pause(self):
+        if self.timer.isActive():
+            self.pause()
+        else:
+            self.resume()
+
+    def pause(self):
+        self.timer.stop()
+        self.reset_btn.setEnabled(True)
+        self.update_timeline()
+
+    def resume(self):
+        if not self.has_next_step():
+            return
+        self.enable_controls(False)
+        self.timer.start(frame_interval())
+        self.update_timeline()
+
+    def step_back(self):
+        self.seek(self.current_step - 1)
+
+    def step_forward(self):
+        self.pause()
+        self.play_steps(1)
+
+    def seek(self, count):
+        """Show the state after `count` steps.
+
+        Recorded steps are rebuilt from the nearest checkpoint, so a seek
+        costs O(n + checkpoint interval) however deep into the run it is.
+        Steps past the recording are played forward from the generator.
+        """
+        if self.trace is None or not self.running:
+            return
+        self.pause()
+        count = max(count, 0)
+        target = min(count, len(self.trace))
+
+        # Replay from the current step when it is closer than the checkpoint
+        start, state, context = self.trace.checkpoint(target)
+        if not start <= self.current_step <= target:
+            self.array[:] = state
+            self.restore_state(context)
+            self.current_step = start
+        while self.current_step < target:
+            self.handle_step(self.trace.step(self.current_step))
+            self.current_step += 1
+
+        self.update_status()
+        self.redraw(None)
+        if count > target:
+            self.play_steps(count - target)
+        else:
+            self.update_timeline()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.bars.resized()
@@ -0,0 +1,68 @@
+"""Algorithm visualizer launcher.
+
+    python main.py                          open the launcher window
+    python main.py --trace-cache traces     also keep finished traces on disk
+    python main.py --headless quick --size 100000 --distribution sorted
+
+The launcher lists every algorithm and only imports its module when its
+window is opened, so startup costs one Qt init however many algorithms
+there are. --headless runs one algorithm's step generator without Qt.
+"""
+import argparse, os, sys
+
+ALGORITHMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "AlgorithmsWindows")
+sys.path.insert(0, ALGORITHMS_DIR)
+
+
+def run_headless(args):
+    import Benchmark
+
+    result = Benchmark.run_case(args.headless, args.size, args.distribution,
+                                args.seed, args.budget, memory=not args.no_memory)
+    Benchmark.print_header()
+    Benchmark.print_row(result)
+    return 0 if result["status"] != "skipped" else 1
+
+
+def run_launcher(args):
+    from PyQt5.QtWidgets import QApplication
+    from Launcher import Launcher
+    from Theme import apply_theme
+    from TraceCache import TRACE_CACHE
+
+    if args.trace_cache:
+        TRACE_CACHE.set_directory(os.path.expanduser(args.trace_cache))
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+    launcher = Launcher()
+    launcher.show()
+    return app.exec_()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Algorithm visualizer")
+    parser.add_argument("--headless", metavar="ALGORITHM",
+                        help="run one algorithm without a display (see Benchmark.ALGORITHMS)")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--distribution", default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=int, default=20_000_000)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--trace-cache", metavar="DIR", help="also cache finished traces on disk in DIR")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        import Benchmark
+        from ArrayGenerator import DISTRIBUTIONS
+
+        if args.headless not in Benchmark.ALGORITHMS:
+            parser.error(f"unknown algorithm {args.headless!r}, choose from: {', '.join(Benchmark.ALGORITHMS)}")
+        if args.distribution not in DISTRIBUTIONS:
+            parser.error(f"unknown distribution {args.distribution!r}, choose from: {', '.join(DISTRIBUTIONS)}")
+        return run_headless(args)
+    return run_launcher(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
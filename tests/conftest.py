@@ -0,0 +1,4 @@
+import os, sys
+
+# The modules import each other by plain name, as when main.py runs them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AlgorithmsWindows"))
@@ -0,0 +1,34 @@
+import pytest
+
+from ArrayGenerator import DISTRIBUTIONS, generate_array
+from Benchmark import ALGORITHMS
+from StepTrace import DONE, apply_step
+
+
+SORTS = [name for name in ALGORITHMS if name not in ("linear", "binary")]
+
+
+@pytest.mark.parametrize("name", SORTS)
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+@pytest.mark.parametrize("duplicates", (False, True))
+@pytest.mark.parametrize("size", (1, 2, 37))
+def test_steps_sort_the_array(name, distribution, duplicates, size):
+    factory, _ = ALGORITHMS[name]
+    initial = generate_array(size, distribution, duplicates, seed=size).tolist()
+    arr = list(initial)
+    steps = list(factory(arr))
+
+    # The engine sorts its own copy, and replaying its steps sorts the input
+    assert arr == sorted(initial)
+    replayed = list(initial)
+    for step in steps:
+        apply_step(replayed, step)
+    assert replayed == sorted(initial)
+    assert steps[-1][0] == DONE
+
+
+@pytest.mark.parametrize("name", ("linear", "binary"))
+def test_search_on_empty_array(name):
+    # Nothing to probe, and no step may point into the array
+    factory, _ = ALGORITHMS[name]
+    assert all(op == DONE for op, _, _, _ in factory([]))
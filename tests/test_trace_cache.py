@@ -0,0 +1,105 @@
+import os
+
+from StepEngines import bubble_sort_steps
+from StepTrace import StepTrace
+from TraceCache import EXTENSION, TraceCache
+from TraceFile import MappedTrace
+
+
+def record(initial):
+    trace = StepTrace(initial)
+    for step in bubble_sort_steps(list(initial)):
+        trace.append(step)
+    return trace
+
+
+def test_key_depends_on_array_and_options():
+    key = TraceCache.key("BubbleSort", [3, 1, 2])
+    assert key == TraceCache.key("BubbleSort", [3, 1, 2])
+    assert key != TraceCache.key("BubbleSort", [3, 2, 1])
+    assert key != TraceCache.key("BubbleSort", [3, 1, 2], ("hoare",))
+    assert key != TraceCache.key("QuickSort", [3, 1, 2])
+
+
+def test_hit_and_miss():
+    cache = TraceCache()
+    trace = record([3, 1, 2])
+    key = TraceCache.key("BubbleSort", trace.initial)
+    assert cache.get(key) is None
+    cache.put(key, trace)
+    assert cache.get(key) is trace
+    assert cache.get(None) is None
+
+
+def test_evicts_least_recently_used_by_size():
+    # Shifted copies of one input record the same steps, so equal sizes
+    traces = [record([value + 10 * k for value in (5, 4, 3, 2, 1)]) for k in range(3)]
+    keys = [TraceCache.key("BubbleSort", trace.initial) for trace in traces]
+    cache = TraceCache(max_bytes=2 * traces[0].nbytes())
+
+    cache.put(keys[0], traces[0])
+    cache.put(keys[1], traces[1])
+    cache.get(keys[0])
+    cache.put(keys[2], traces[2])
+
+    # keys[1] was used least recently
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is traces[0]
+    assert cache.get(keys[2]) is traces[2]
+    assert cache.size <= cache.max_bytes
+
+
+def test_oversized_trace_is_not_kept():
+    trace = record([4, 3, 2, 1])
+    cache = TraceCache(max_bytes=trace.nbytes() - 1)
+    cache.put("key", trace)
+    assert cache.get("key") is None
+
+
+def test_disk_tier(tmp_path):
+    trace = record([6, 2, 5, 1, 4, 3])
+    key = TraceCache.key("BubbleSort", trace.initial)
+    TraceCache(directory=str(tmp_path)).put(key, trace)
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith(EXTENSION)
+
+    # A fresh cache, as in a new process, falls back to the file
+    cached = TraceCache(directory=str(tmp_path)).get(key)
+    assert isinstance(cached, MappedTrace)
+    assert len(cached) == len(trace)
+    assert cached.state_at(len(trace) - 1) == trace.final_state()
+    cached.close()
+
+
+def test_damaged_disk_entry_is_a_miss(tmp_path):
+    trace = record([3, 1, 2])
+    key = TraceCache.key("BubbleSort", trace.initial)
+    TraceCache(directory=str(tmp_path)).put(key, trace)
+    path = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+    with open(path, "wb") as f:
+        f.write(b"not a trace")
+
+    assert TraceCache(directory=str(tmp_path)).get(key) is None
+    assert not os.path.exists(path)
+
+
+def test_disk_trimmed_oldest_first(tmp_path):
+    traces = [record([value + 10 * k for value in (9, 8, 7, 6, 5)]) for k in range(3)]
+    keys = [TraceCache.key("BubbleSort", trace.initial) for trace in traces]
+    cache = TraceCache(directory=str(tmp_path))
+    for k in range(2):
+        cache.put(keys[k], traces[k])
+        # Distinct modification times, oldest first
+        for entry in os.scandir(tmp_path):
+            if entry.stat().st_mtime > 1000:
+                os.utime(entry.path, (k + 1, k + 1))
+
+    # Room for two files on disk: the third put drops the oldest
+    cache.max_disk_bytes = sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+    cache.put(keys[2], traces[2])
+    assert len(os.listdir(tmp_path)) == 2
+
+    fresh = TraceCache(directory=str(tmp_path))
+    assert fresh.get(keys[0]) is None
+    assert fresh.get(keys[1]) is not None
+    assert fresh.get(keys[2]) is not None
@@ -0,0 +1,79 @@
+import pytest
+
+from ArrayGenerator import generate_array
+from StepEngines import quick_sort_steps, merge_sort_steps
+from StepTrace import StepTrace, apply_step
+from TraceFile import MappedTrace, save_trace
+
+
+def record(engine, size=40, **options):
+    initial = generate_array(size, seed=7).tolist()
+    trace = StepTrace(initial, checkpoint_interval=size)
+    played = 0
+
+    def context():
+        return {"played": played, "active": [played, played + 1]}
+
+    for step in engine(list(initial), **options):
+        trace.append(step, context)
+        played += 1
+    return trace
+
+
+@pytest.fixture(params=[(quick_sort_steps, {"scheme": "hoare"}), (merge_sort_steps, {})],
+                ids=["quick_hoare", "merge"])
+def trace(request):
+    engine, options = request.param
+    return record(engine, **options)
+
+
+def test_state_at_matches_replay(trace):
+    arr = list(trace.initial)
+    for index in range(len(trace)):
+        apply_step(arr, trace.step(index))
+        assert trace.state_at(index) == arr
+    assert trace.final_state() == sorted(trace.initial)
+
+
+def test_save_load_round_trip(trace, tmp_path):
+    path = str(tmp_path / "run.trace")
+    save_trace(path, trace, {"algorithm": "QuickSort", "params": ["hoare", "last"]})
+    loaded = MappedTrace(path)
+    try:
+        assert len(loaded) == len(trace)
+        assert loaded.initial == trace.initial
+        assert loaded.metadata == {"algorithm": "QuickSort", "params": ["hoare", "last"]}
+        for index in range(len(trace)):
+            assert loaded.step(index) == trace.step(index)
+    finally:
+        loaded.close()
+
+
+def test_loaded_trace_seeks(trace, tmp_path):
+    path = str(tmp_path / "run.trace")
+    save_trace(path, trace)
+    loaded = MappedTrace(path)
+    try:
+        for index in (-1, 0, 1, len(trace) // 2, len(trace) - 1):
+            assert loaded.state_at(index) == trace.state_at(index)
+
+            # Checkpoint contexts come back with lists as tuples
+            start, state, context = loaded.checkpoint(index)
+            expected_start, expected_state, expected_context = trace.checkpoint(index)
+            assert (start, state) == (expected_start, list(expected_state))
+            if expected_context is None:
+                assert context is None
+            else:
+                assert context == {"played": expected_context["played"],
+                                   "active": tuple(expected_context["active"])}
+    finally:
+        loaded.close()
+
+
+def test_damaged_file_is_rejected(trace, tmp_path):
+    path = str(tmp_path / "run.trace")
+    save_trace(path, trace)
+    with open(path, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 5)
+    with pytest.raises(ValueError):
+        MappedTrace(path)